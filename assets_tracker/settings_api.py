@@ -0,0 +1,52 @@
+"""
+API-only settings for short-lived workers: the JWT API without the admin,
+sessions, messages, static files or CSRF, so a new process imports and
+checks less before it answers its first request.
+
+    DJANGO_SETTINGS_MODULE=assets_tracker.settings_api gunicorn assets_tracker.wsgi
+
+Measure with `manage.py benchmark_startup`.
+"""
+from assets_tracker.settings import *  # noqa: F401,F403
+from assets_tracker.settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+# Admin, sessions and messages serve the browser UI; the API authenticates
+# every request from its bearer token (tracker.authentication).
+API_ONLY_REMOVED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+API_ONLY_REMOVED_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    # CSRF protects cookie-authenticated requests; a bearer token is not sent by the browser on its own.
+    'django.middleware.csrf.CsrfViewMiddleware',
+    # DRF sets request.user itself.
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_ONLY_REMOVED_APPS]
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in API_ONLY_REMOVED_MIDDLEWARE]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+# JSON only: the browsable API needs sessions to log in and static files to render.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
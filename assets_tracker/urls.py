@@ -1,7 +1,15 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
+from tracker.metrics import metrics_view
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include("tracker.urls")),
+    path('metrics', metrics_view, name='metrics'),
 ]
+
+# Not installed in the API-only profile (assets_tracker.settings_api).
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -0,0 +1,228 @@
+import datetime
+import itertools
+from collections import defaultdict
+
+from django.db import connections, router, transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from tracker.models import ArchivedDeviceLog, Device, DeviceLog, DeviceUsageDaily, Employee, EmployeeUsageDaily
+
+ROLLUP_FIELDS = ('loans', 'returns', 'checked_out_seconds')
+BACKFILL_CHUNK_SIZE = 5000
+UPSERT_BATCH_SIZE = 500
+
+
+def split_by_day(start, end):
+    """
+    Seconds of [start, end) falling on each local calendar day.
+    """
+    seconds = {}
+    # Whole seconds, so the per-day parts add up to the loan's duration.
+    start = timezone.localtime(start).replace(microsecond=0)
+    end = timezone.localtime(end).replace(microsecond=0)
+    while start < end:
+        next_day = timezone.make_aware(datetime.datetime.combine(start.date() + datetime.timedelta(days=1), datetime.time.min))
+        stop = min(end, next_day)
+        seconds[start.date()] = seconds.get(start.date(), 0) + int((stop - start).total_seconds())
+        start = stop
+    return seconds
+
+
+class Increments:
+    """
+    Collects rollup increments for one or many loans before writing them.
+    """
+
+    def __init__(self):
+        self.devices = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+        self.employees = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+        self.companies = {}
+
+    def add(self, company_id, device_id, employee_id, day, **values):
+        self.companies[('device', device_id)] = company_id
+        self.companies[('employee', employee_id)] = company_id
+        for field, value in values.items():
+            self.devices[(device_id, day)][field] += value
+            self.employees[(employee_id, day)][field] += value
+
+    def check_out(self, company_id, device_id, employee_id, at):
+        self.add(company_id, device_id, employee_id, timezone.localdate(at), loans=1)
+
+    def check_in(self, company_id, device_id, employee_id, started, ended):
+        self.add(company_id, device_id, employee_id, timezone.localdate(ended), returns=1)
+        for day, seconds in split_by_day(started, ended).items():
+            self.add(company_id, device_id, employee_id, day, checked_out_seconds=seconds)
+
+    def save(self):
+        with transaction.atomic(using=router.db_for_write(DeviceUsageDaily), savepoint=False):
+            _accumulate(DeviceUsageDaily, 'device', self.devices, self.companies)
+            _accumulate(EmployeeUsageDaily, 'employee', self.employees, self.companies)
+
+
+def _accumulate(model, key, increments, companies):
+    """
+    Add `increments` {(key_id, day): {field: value}} to the rollup rows with
+    one `INSERT ... ON CONFLICT DO UPDATE` per UPSERT_BATCH_SIZE rows, so
+    concurrent writers add to the same row instead of racing to create it.
+    """
+    if not increments:
+        return
+    connection = connections[router.db_for_write(model)]
+    fields = [model._meta.get_field(name) for name in ('company', key, 'day', *ROLLUP_FIELDS)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = [connection.ops.quote_name(field.column) for field in fields]
+    conflict = ', '.join(connection.ops.quote_name(model._meta.get_field(name).column) for name in (key, 'day'))
+    updates = ', '.join(
+        f'{column} = {table}.{column} + excluded.{column}' for column in columns[-len(ROLLUP_FIELDS):]
+    )
+    rows = [
+        (companies[(key, key_id)], key_id, day, *(values[name] for name in ROLLUP_FIELDS))
+        for (key_id, day), values in increments.items()
+    ]
+    placeholders = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[offset:offset + UPSERT_BATCH_SIZE]
+            params = [field.get_db_prep_value(value, connection) for row in batch for field, value in zip(fields, row)]
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(columns)}) VALUES {", ".join([placeholders] * len(batch))} '
+                f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}',
+                params,
+            )
+
+
+def record_check_outs(company_id, logs):
+    """
+    Count new loans of one company's devices.
+    """
+    increments = Increments()
+    for log in logs:
+        increments.check_out(company_id, log.device_id, log.checked_out_by_id, log.created_at)
+    increments.save()
+
+
+def record_check_ins(company_id, logs):
+    """
+    Add the duration of returned loans; `logs` must have `returned_at` set.
+    """
+    increments = Increments()
+    for log in logs:
+        increments.check_in(company_id, log.device_id, log.checked_out_by_id, log.created_at, log.returned_at)
+    increments.save()
+
+
+# Backfill
+def rebuild_rollups(company_ids=None, chunk_size=BACKFILL_CHUNK_SIZE):
+    """
+    Recompute the rollups from DeviceLog history, archived loans included,
+    one company at a time.
+    """
+    companies = (
+        Device.objects.filter(**({'owner_id__in': company_ids} if company_ids else {}))
+        .order_by().values_list('owner_id', flat=True).distinct()
+    )
+    rebuilt = 0
+    for company_id in companies:
+        increments = Increments()
+        rows = itertools.chain.from_iterable(
+            queryset.values_list('device_id', 'checked_out_by_id', 'created_at', 'returned_at').iterator(chunk_size=chunk_size)
+            for queryset in (
+                DeviceLog.objects.filter(company_id=company_id),
+                ArchivedDeviceLog.objects.filter(company_id=company_id),
+            )
+        )
+        for device_id, employee_id, created_at, returned_at in rows:
+            increments.check_out(company_id, device_id, employee_id, created_at)
+            if returned_at is not None:
+                increments.check_in(company_id, device_id, employee_id, created_at, returned_at)
+            rebuilt += 1
+        with transaction.atomic():
+            DeviceUsageDaily.objects.filter(company_id=company_id).delete()
+            EmployeeUsageDaily.objects.filter(company_id=company_id).delete()
+            for model, key, values in (
+                (DeviceUsageDaily, 'device', increments.devices),
+                (EmployeeUsageDaily, 'employee', increments.employees),
+            ):
+                model.objects.bulk_create(
+                    [model(company_id=company_id, day=day, **{f'{key}_id': key_id}, **fields) for (key_id, day), fields in values.items()],
+                    batch_size=chunk_size,
+                )
+    return rebuilt
+
+
+# Reports
+def _window(since, until):
+    until = until or timezone.localdate()
+    since = since or until - datetime.timedelta(days=29)
+    return since, until
+
+
+def _average(seconds, returns):
+    return round(seconds / returns) if returns else None
+
+
+def device_utilization(company, since=None, until=None):
+    since, until = _window(since, until)
+    window_start = timezone.make_aware(datetime.datetime.combine(since, datetime.time.min))
+    window_end = min(
+        timezone.now(),
+        timezone.make_aware(datetime.datetime.combine(until + datetime.timedelta(days=1), datetime.time.min)),
+    )
+    window_seconds = max(0, int((window_end - window_start).total_seconds()))
+
+    # Every device of the company, including idle ones, with the start of its open loan if any:
+    # open loans are not in the rollups until they are returned.
+    devices = (
+        Device.objects.filter(owner=company)
+        .values('pk', 'name', 'serial_no', 'current_log__created_at')
+        .order_by('pk')
+    )
+    usage = {
+        row['device_id']: row for row in
+        DeviceUsageDaily.objects.filter(company=company, day__range=(since, until))
+        .values('device_id')
+        .annotate(loans=Sum('loans'), returns=Sum('returns'), checked_out_seconds=Sum('checked_out_seconds'))
+        # Grouped on the id alone, so device_usage_report_idx yields the groups in order.
+        .order_by('device_id')
+    }
+    report = []
+    for device in devices:
+        row = usage.get(device['pk'], {'loans': 0, 'returns': 0, 'checked_out_seconds': 0})
+        open_seconds = 0
+        started = device['current_log__created_at']
+        if started is not None and started < window_end:
+            open_seconds = int((window_end - max(started, window_start)).total_seconds())
+        busy = row['checked_out_seconds'] + open_seconds
+        report.append({
+            'device': device['pk'],
+            'name': device['name'],
+            'serial_no': device['serial_no'],
+            'loans': row['loans'],
+            'checked_out_seconds': busy,
+            'average_loan_seconds': _average(row['checked_out_seconds'], row['returns']),
+            'idle_seconds': max(0, window_seconds - busy),
+        })
+    return {'since': since, 'until': until, 'results': report}
+
+
+def employee_utilization(company, since=None, until=None):
+    since, until = _window(since, until)
+    employees = Employee.objects.filter(pk=OuterRef('employee_id'))
+    rows = (
+        EmployeeUsageDaily.objects.filter(company=company, day__range=(since, until))
+        .values('employee_id')
+        .annotate(loans=Sum('loans'), returns=Sum('returns'), checked_out_seconds=Sum('checked_out_seconds'))
+        # Grouped on the id alone, so employee_usage_report_idx yields the groups in order.
+        .annotate(name=Subquery(employees.values('name')), email=Subquery(employees.values('email')))
+        .order_by('employee_id')
+    )
+    report = [{
+        'employee': row['employee_id'],
+        'name': row['name'],
+        'email': row['email'],
+        'loans': row['loans'],
+        'checked_out_seconds': row['checked_out_seconds'],
+        'average_loan_seconds': _average(row['checked_out_seconds'], row['returns']),
+    } for row in rows]
+    return {'since': since, 'until': until, 'results': report}
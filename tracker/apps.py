@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tracker'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from tracker import signals  # noqa: F401
+        from tracker.metrics import install_query_timer
+        from tracker.profiling import install_query_profiler
+        connection_created.connect(install_query_timer, dispatch_uid='tracker-metrics-query-timer')
+        connection_created.connect(install_query_profiler, dispatch_uid='tracker-slow-query-profiler')
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from tracker.models import ArchivedDeviceLog, Device, DeviceLog
+from tracker.versioning import bump_company_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AFTER_DAYS = 90
+DEFAULT_BATCH_SIZE = 1000
+ARCHIVED_COLUMNS = (
+    'id', 'company_id', 'device_id', 'checked_out_by_id', 'checked_out_condition', 'checked_in_condition',
+    'created_at', 'updated_at', 'returned_at',
+)
+
+
+def archive_options():
+    return getattr(settings, 'TRACKER_ARCHIVE', {})
+
+
+def archive_cutoff(after_days=None):
+    """
+    Loans returned before this moment are cold.
+    """
+    if after_days is None:
+        after_days = archive_options().get('AFTER_DAYS', DEFAULT_AFTER_DAYS)
+    return timezone.now() - timezone.timedelta(days=after_days)
+
+
+def _delete_logs(alias, ids):
+    """
+    DELETE the DeviceLog rows `ids` in one statement, bypassing the delete
+    collector and its per-row post_delete signals (a version bump each).
+    Only safe for rows no foreign key points at.
+    """
+    connection = connections[alias]
+    table = connection.ops.quote_name(DeviceLog._meta.db_table)
+    column = connection.ops.quote_name(DeviceLog._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(ids))})", ids)
+
+
+def archive_batch(cutoff, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Move up to `batch_size` of the oldest loans returned before `cutoff`
+    into ArchivedDeviceLog, in one short transaction. Returns the number
+    of rows moved.
+    """
+    alias = router.db_for_write(DeviceLog)
+    with transaction.atomic(using=alias):
+        rows = list(
+            DeviceLog.objects.using(alias)
+            .filter(returned_at__isnull=False, returned_at__lt=cutoff)
+            # A device still pointing at a returned loan keeps it hot.
+            .exclude(Exists(Device.objects.filter(current_log=OuterRef('pk'))))
+            .order_by('returned_at')
+            .values(*ARCHIVED_COLUMNS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ArchivedDeviceLog.objects.using(alias).bulk_create([ArchivedDeviceLog(**row) for row in rows])
+        # Device.current_log is the only foreign key to DeviceLog and is
+        # excluded above; one bump per company below covers the batch.
+        _delete_logs(alias, [row['id'] for row in rows])
+        for company_id in {row['company_id'] for row in rows}:
+            bump_company_version(company_id)
+    return len(rows)
+
+
+def archive_closed_logs(after_days=None, batch_size=None, max_batches=None, pause=0.0, on_batch=None):
+    """
+    Archive every loan closed longer than `after_days` ago, batch by batch.
+
+    Each batch commits on its own, so writers wait at most one batch, and
+    an interrupted run simply continues where it stopped next time.
+    `pause` seconds between batches leave room for other writers.
+    """
+    cutoff = archive_cutoff(after_days)
+    if batch_size is None:
+        batch_size = archive_options().get('BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        if on_batch:
+            on_batch(total)
+        if moved < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def run_periodically(interval, stop=None, on_run=None, **options):
+    """
+    Call `archive_closed_logs(**options)` every `interval` seconds until
+    `stop` (a threading.Event) is set; used by `archive_device_logs --loop`.
+    A failed pass is logged and retried on the next tick.
+    """
+    stop = stop or threading.Event()
+    while not stop.wait(interval):
+        try:
+            moved = archive_closed_logs(**options)
+            if moved:
+                logger.info("Archived %d closed device logs.", moved)
+            if on_run:
+                on_run(moved)
+        except Exception:
+            logger.exception("Device log archival failed.")
+        finally:
+            connection.close()
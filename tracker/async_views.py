@@ -0,0 +1,204 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from tracker import versioning
+from tracker.authentication import AsyncJWTAuthentication
+from tracker.fieldsets import only_fields, parse_fieldset
+from tracker.filters import ArchivedDeviceLogFilter, DeviceFilter, DeviceLogFilter, EmployeeFilter
+from tracker.models import ArchivedDeviceLog, Device, DeviceLog, Employee
+from tracker.pagination import KeysetPagination
+from tracker.serializers import (
+    ArchivedDeviceLogSerializer, DeviceLogHistorySerializer, DeviceLogSerializer, DeviceSerializer, EmployeeSerializer,
+)
+from tracker.tenancy import aget_company_for_user
+
+
+class AsyncReadView(View):
+    """
+    Native async counterpart of a company-scoped DRF read view.
+
+    DRF views are synchronous, so under ASGI each request is handed to a
+    worker thread. These views authenticate, resolve the tenant, answer
+    conditional requests and read their rows with the async ORM, then reuse
+    the DRF serializers, pagination and JSON renderer so the bodies match
+    the sync endpoints.
+    """
+    authentication = AsyncJWTAuthentication()
+    renderer = JSONRenderer()
+    serializer_class = None
+    select_related_fields = ()
+
+    async def get(self, request, *args, **kwargs):
+        drf_request = Request(request, authenticators=[])
+        drf_request.accepted_renderer = self.renderer
+        drf_request.accepted_media_type = self.renderer.media_type
+        try:
+            authenticated = await self.authentication.aauthenticate(request)
+            if authenticated is None:
+                raise NotAuthenticated()
+            drf_request.user, drf_request.auth = authenticated
+            company = await aget_company_for_user(drf_request.user)
+            if company is None:
+                raise NotFound("Company not found")
+            return await self.conditional_response(drf_request, company, *args, **kwargs)
+        except APIException as exc:
+            response = self.render(exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}, exc.status_code)
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+
+    async def conditional_response(self, request, company, *args, **kwargs):
+        # Same validators as tracker.mixins.ConditionalGetMixin.
+        version, updated_at = await versioning.aget_company_version(company.pk)
+        etag = versioning.make_etag(company.pk, version, request)
+        last_modified = int(updated_at.timestamp())
+
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            data = await versioning.aget_cached_response(etag) if versioning.response_cache_enabled() else None
+            if data is None:
+                data = await self.get_data(request, company, *args, **kwargs)
+                if versioning.response_cache_enabled():
+                    await versioning.acache_response(etag, data)
+            response = self.render(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type=self.renderer.media_type)
+
+    def get_queryset(self, company):
+        raise NotImplementedError
+
+    def get_serializer(self, request, *args, **kwargs):
+        context = {'request': request, 'fieldset': parse_fieldset(request.query_params)}
+        return self.serializer_class(*args, context=context, **kwargs)
+
+    def scoped_queryset(self, request, company, ordering=()):
+        # Same query plan as tracker.mixins.QueryPlanMixin, fieldsets included.
+        queryset = self.get_queryset(company)
+        fieldset = parse_fieldset(request.query_params)
+        select_related = self.select_related_fields if fieldset is None else fieldset.select_related(self.select_related_fields)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if fieldset is not None:
+            queryset = queryset.only(*only_fields(self.get_serializer(request), ordering))
+        return queryset
+
+    async def get_data(self, request, company, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncListView(AsyncReadView):
+    pagination_class = KeysetPagination
+    # Same query parameters as the sync list views; the paginator reads
+    # `?ordering=` through OrderingFilter and `ordering_fields`.
+    filterset_class = None
+    filter_backends = [OrderingFilter]
+    ordering_fields = ()
+
+    def filter_queryset(self, request, queryset):
+        if self.filterset_class is None:
+            return queryset
+        filterset = self.filterset_class(request.query_params, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset.qs
+
+    async def get_data(self, request, company):
+        paginator = self.pagination_class()
+        ordering = paginator.get_ordering(request, self.get_queryset(company), self)
+        queryset = self.filter_queryset(request, self.scoped_queryset(request, company, ordering))
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(request, page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+
+class AsyncDetailView(AsyncReadView):
+
+    async def get_data(self, request, company, pk):
+        queryset = self.scoped_queryset(request, company)
+        try:
+            instance = await queryset.aget(pk=pk)
+        except ObjectDoesNotExist:
+            raise NotFound(f"No {queryset.model._meta.object_name} matches the given query.")
+        except ValueError:
+            raise NotFound()
+        return self.get_serializer(request, instance).data
+
+
+# Employees
+class AsyncEmployeeQuery:
+    serializer_class = EmployeeSerializer
+    select_related_fields = ('company__owner',)
+
+    def get_queryset(self, company):
+        return Employee.objects.filter(company=company)
+
+class AsyncEmployeeListView(AsyncEmployeeQuery, AsyncListView):
+    filterset_class = EmployeeFilter
+    ordering_fields = ['created_at', 'name']
+
+class AsyncEmployeeDetailView(AsyncEmployeeQuery, AsyncDetailView):
+    pass
+
+# Devices
+class AsyncDeviceQuery:
+    serializer_class = DeviceSerializer
+    select_related_fields = ('owner__owner',)
+
+    def get_queryset(self, company):
+        return Device.objects.filter(owner=company)
+
+class AsyncDeviceListView(AsyncDeviceQuery, AsyncListView):
+    filterset_class = DeviceFilter
+    ordering_fields = ['created_at', 'name']
+
+class AsyncDeviceDetailView(AsyncDeviceQuery, AsyncDetailView):
+    pass
+
+# Device logs
+class AsyncDeviceLogListView(AsyncListView):
+    serializer_class = DeviceLogSerializer
+    filterset_class = DeviceLogFilter
+    ordering_fields = ['created_at']
+    archived = False
+
+    async def get_data(self, request, company):
+        # As tracker.views.DeviceLogView: ?archived=true reads the archive table.
+        serializer = DeviceLogHistorySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data['archived']:
+            self.archived = True
+            self.serializer_class, self.filterset_class = ArchivedDeviceLogSerializer, ArchivedDeviceLogFilter
+        return await super().get_data(request, company)
+
+    def get_queryset(self, company):
+        if self.archived:
+            return ArchivedDeviceLog.objects.filter(company=company)
+        return DeviceLog.objects.filter(company=company)
+
+
+class AsyncApiRootView(View):
+    """
+    Async counterpart of the router's API root: links to the async endpoints.
+    """
+    routes = {
+        'employees': 'async-employee-list',
+        'devices': 'async-device-list',
+        'device-logs': 'async-device-logs',
+    }
+
+    async def get(self, request):
+        data = {name: request.build_absolute_uri(reverse(route)) for name, route in self.routes.items()}
+        return HttpResponse(JSONRenderer().render(data), content_type='application/json')
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Claims added by tracker.views.get_tokens_for_user
+COMPANY_CLAIM = 'company_id'
+STAFF_CLAIM = 'is_staff'
+
+
+class ClaimsUser(TokenUser):
+    """
+    The requesting user as described by their access token.
+
+    Compares equal to the User row the token was issued for, so ownership
+    checks such as `request.user == company.owner` work unchanged.
+    """
+
+    @cached_property
+    def id(self):
+        # The claim is serialized as a string; restore the primary key type.
+        return get_user_model()._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def company_id(self):
+        # The company owned when the token was issued; tracker.tenancy.check_company_claim rejects it once stale.
+        return self.token.get(COMPANY_CLAIM)
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenUser, AbstractBaseUser)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = TokenUser.__hash__
+
+
+def has_user_claims(validated_token):
+    return api_settings.USER_ID_CLAIM in validated_token and COMPANY_CLAIM in validated_token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the claims of the access token instead of
+    loading the User row on every request.
+
+    Changes to a user (deactivation, staff flag) therefore take effect when
+    their access token expires, which is why ACCESS_TOKEN_LIFETIME is short.
+    Tokens issued before the claims existed are checked against the database.
+    """
+
+    def get_user(self, validated_token):
+        if has_user_claims(validated_token):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+class AsyncJWTAuthentication(ClaimsJWTAuthentication):
+    """
+    ClaimsJWTAuthentication for the async views: the token is validated as
+    usual, only the fallback user lookup goes through the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if has_user_claims(validated_token):
+            return ClaimsUser(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,697 @@
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker import analytics
+from tracker.models import Company, Employee, Device, DeviceLog, RevokedToken, User
+from tracker.revocation import revocation_store
+
+DEFAULT_BUDGETS_PATH = Path(__file__).resolve().parent / 'benchmark_budgets.json'
+BENCH_EMAIL = 'bench-owner@bench.test'
+BENCH_PASSWORD = 'bench-password-123'
+IMPORT_ROWS = 100
+
+
+# Dataset
+def seed_dataset(companies=5, employees=50, devices=100, logs=5, pool=0, batch=10):
+    """
+    Fill the database with `companies` tenants of the given size.
+
+    The first tenant is owned by the benchmark user. It also gets `pool` spare
+    available devices (consumed by check-out) and `pool` open loans (consumed
+    by check-in) so write routes can be hit repeatedly, plus `pool` batches of
+    `batch` of each for the bulk routes.
+    """
+    owner = User.objects.create_user(username='bench-owner', email=BENCH_EMAIL, password=BENCH_PASSWORD)
+    unusable = make_password(None)
+    now = timezone.now()
+    others = User.objects.bulk_create([
+        User(username=f'bench-owner-{c}', email=f'bench-owner-{c}@bench.test', password=unusable)
+        for c in range(1, companies)
+    ])
+    tenants = Company.objects.bulk_create(
+        [Company(name='Bench Company 0', owner=owner)]
+        + [Company(name=f'Bench Company {c}', owner=user) for c, user in enumerate(others, start=1)]
+    )
+    for c, company in enumerate(tenants):
+        staff = Employee.objects.bulk_create([
+            Employee(name=f'Employee {c}-{e}', email=f'employee-{c}-{e}@bench.test', address='Bench Street', company=company)
+            for e in range(employees)
+        ])
+        stock = Device.objects.bulk_create([
+            Device(name=f'Device {c}-{d}', serial_no=f'SN-{c}-{d}', owner=company)
+            for d in range(devices)
+        ])
+        if staff:
+            DeviceLog.objects.bulk_create([
+                DeviceLog(
+                    company=company,
+                    device=device,
+                    checked_out_by=staff[(d + l) % len(staff)],
+                    checked_out_condition='good',
+                    checked_in_condition='good',
+                    returned_at=now,
+                )
+                for d, device in enumerate(stock)
+                for l in range(logs)
+            ])
+
+    analytics.rebuild_rollups()
+
+    company = tenants[0]
+    employee = Employee.objects.create(
+        name='Bench Employee', email='bench-employee@bench.test', address='Bench Street', company=company
+    )
+    spare = pool * (batch + 1)
+    checkout_pool = Device.objects.bulk_create([
+        Device(name=f'Checkout Device {i}', serial_no=f'SN-OUT-{i}', owner=company) for i in range(spare)
+    ])
+    checkin_devices = Device.objects.bulk_create([
+        Device(name=f'Checkin Device {i}', serial_no=f'SN-IN-{i}', owner=company, is_available=False)
+        for i in range(spare)
+    ])
+    checkin_pool = DeviceLog.objects.bulk_create([
+        DeviceLog(company=company, device=device, checked_out_by=employee, checked_out_condition='good')
+        for device in checkin_devices
+    ])
+    Device.objects.bulk_update(
+        [Device(pk=log.device_id, current_log=log) for log in checkin_pool], ['current_log']
+    )
+    return {
+        'user': owner,
+        'company': company,
+        'employee': employee,
+        'device': Device.objects.filter(owner=company).first(),
+        'checkout_pool': [device.pk for device in checkout_pool[:pool]],
+        'checkin_pool': [log.pk for log in checkin_pool[:pool]],
+        'bulk_checkout_pool': _batches([device.pk for device in checkout_pool[pool:]], batch),
+        'bulk_checkin_pool': _batches([log.pk for log in checkin_pool[pool:]], batch),
+    }
+
+
+def _batches(values, size):
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+# Scenarios
+def build_scenarios(dataset):
+    """
+    One scenario per route name in tracker/urls.py. Each scenario returns
+    (method, path, payload[, format]) for the i-th request.
+    """
+    from tracker.views import get_tokens_for_user
+
+    company = dataset['company']
+    employee = dataset['employee']
+    device = dataset['device']
+    checkout_pool = dataset['checkout_pool']
+    checkin_pool = dataset['checkin_pool']
+    bulk_checkout_pool = dataset['bulk_checkout_pool']
+    bulk_checkin_pool = dataset['bulk_checkin_pool']
+    return {
+        'api-root': lambda i: ('get', reverse('api-root'), None),
+        'company-api-list': lambda i: ('get', reverse('company-api-list'), None),
+        'company-api-detail': lambda i: ('get', reverse('company-api-detail', args=[company.pk]), None),
+        'employee-api-list': lambda i: ('get', reverse('employee-api-list'), None),
+        'employee-api-detail': lambda i: ('get', reverse('employee-api-detail', args=[employee.pk]), None),
+        'device-api-list': lambda i: ('get', reverse('device-api-list'), None),
+        'device-api-detail': lambda i: ('get', reverse('device-api-detail', args=[device.pk]), None),
+        'device-api-checked-out': lambda i: ('get', reverse('device-api-checked-out'), None),
+        'device-logs-api': lambda i: ('get', reverse('device-logs-api'), None),
+        'check-out': lambda i: ('post', reverse('check-out'), {
+            'device': checkout_pool[i],
+            'checked_out_by': employee.pk,
+            'checked_out_condition': 'good',
+        }),
+        'check-in': lambda i: ('put', reverse('check-in', args=[checkin_pool[i]]), {
+            'checked_in_condition': 'good',
+        }),
+        'bulk-check-out': lambda i: ('post', reverse('bulk-check-out'), {'items': [
+            {'device': device_id, 'checked_out_by': employee.pk, 'checked_out_condition': 'good'}
+            for device_id in bulk_checkout_pool[i]
+        ]}),
+        'bulk-check-in': lambda i: ('post', reverse('bulk-check-in'), {'items': [
+            {'log': log_id, 'checked_in_condition': 'good'} for log_id in bulk_checkin_pool[i]
+        ]}),
+        'export-device-logs': lambda i: ('get', reverse('export-device-logs'), None),
+        'export-devices': lambda i: ('get', reverse('export-devices'), {'format': 'ndjson'}),
+        'export-employees': lambda i: ('get', reverse('export-employees'), None),
+        'analytics-devices': lambda i: ('get', reverse('analytics-devices'), None),
+        'analytics-employees': lambda i: ('get', reverse('analytics-employees'), None),
+        'async-api-root': lambda i: ('get', reverse('async-api-root'), None),
+        'async-employee-list': lambda i: ('get', reverse('async-employee-list'), None),
+        'async-employee-detail': lambda i: ('get', reverse('async-employee-detail', args=[employee.pk]), None),
+        'async-device-list': lambda i: ('get', reverse('async-device-list'), None),
+        'async-device-detail': lambda i: ('get', reverse('async-device-detail', args=[device.pk]), None),
+        'async-device-logs': lambda i: ('get', reverse('async-device-logs'), None),
+        'search': lambda i: ('get', reverse('search', args=['devices']), {'q': f'Device 0-{i % 10}'}),
+        'import': lambda i: ('post', reverse('import', args=['employees']), {
+            'file': SimpleUploadedFile('employees.csv', import_csv(i, IMPORT_ROWS), content_type='text/csv'),
+        }, 'multipart'),
+        'login-api': lambda i: ('post', reverse('login-api'), {
+            'email': BENCH_EMAIL,
+            'password': BENCH_PASSWORD,
+        }),
+        'token-refresh': lambda i: ('post', reverse('token-refresh'), {
+            'refresh': get_tokens_for_user(dataset['user'])['refresh'],
+        }),
+    }
+
+
+def import_csv(i, rows):
+    lines = ['name,email,address'] + [
+        f'Imported {i}-{r},imported-{i}-{r}@bench.test,Bench Street' for r in range(rows)
+    ]
+    return '\n'.join(lines).encode()
+
+
+def tracker_route_names():
+    from tracker import urls
+
+    names = set()
+
+    def collect(patterns):
+        for pattern in patterns:
+            if hasattr(pattern, 'url_patterns'):
+                collect(pattern.url_patterns)
+            elif pattern.name:
+                names.add(pattern.name)
+
+    collect(urls.urlpatterns)
+    return names
+
+
+# Runner
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def authenticated_client():
+    client = APIClient()
+    response = client.post(reverse('login-api'), {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}, format='json')
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['token']['access']}")
+    return client
+
+
+def run_scenarios(scenarios, iterations=20, warmup=2, client=None):
+    client = client or authenticated_client()
+    results = []
+    for name, scenario in scenarios.items():
+        timings, queries, sizes, statuses = [], [], [], {}
+        for i in range(warmup + iterations):
+            method, path, payload, *fmt = scenario(i)
+            # The query log is a bounded deque; start every request from an empty one.
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, payload, format=fmt[0] if fmt else 'json')
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = (time.perf_counter() - started) * 1000
+            if i < warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(len(ctx.captured_queries))
+            sizes.append(len(body))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        results.append({
+            'route': name,
+            'method': method.upper(),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'queries': max(queries),
+            'bytes': max(sizes),
+            'statuses': statuses,
+        })
+    return results
+
+
+# Concurrency: sync DRF views vs their async counterparts, both behind Django's ASGI handler
+ASGI_PAIRS = (
+    ('employee-api-list', 'async-employee-list'),
+    ('employee-api-detail', 'async-employee-detail'),
+    ('device-api-list', 'async-device-list'),
+    ('device-api-detail', 'async-device-detail'),
+    ('device-logs-api', 'async-device-logs'),
+)
+
+
+def run_concurrent(path, concurrency, requests, token=None, payloads=None):
+    """
+    Send `requests` GETs to `path` from `concurrency` concurrent ASGI clients,
+    or POSTs of the JSON bodies in `payloads` when given.
+    """
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    bodies = iter(payloads) if payloads is not None else None
+
+    async def worker(client, count, timings, statuses):
+        for _ in range(count):
+            started = time.perf_counter()
+            if bodies is None:
+                response = await client.get(path, headers=headers)
+            else:
+                response = await client.post(path, next(bodies), content_type='application/json', headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def run():
+        timings, statuses = [], {}
+        clients = [AsyncClient() for _ in range(concurrency)]
+        counts = [requests // concurrency + (1 if c < requests % concurrency else 0) for c in range(concurrency)]
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, count, timings, statuses) for client, count in zip(clients, counts)))
+        return timings, statuses, time.perf_counter() - started
+
+    timings, statuses, elapsed = asyncio.run(run())
+    return {
+        'rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'statuses': statuses,
+    }
+
+
+def run_asgi_comparison(scenarios, token, concurrency_levels=(1, 10, 50), requests=200, warmup=10):
+    results = []
+    for sync_route, async_route in ASGI_PAIRS:
+        for concurrency in concurrency_levels:
+            for mode, route in (('sync', sync_route), ('async', async_route)):
+                _, path, _ = scenarios[route](0)
+                run_concurrent(path, 1, warmup, token)
+                results.append({
+                    'route': sync_route,
+                    'mode': mode,
+                    'concurrency': concurrency,
+                    **run_concurrent(path, concurrency, requests, token),
+                })
+    return results
+
+
+# Token refresh with a growing revocation table
+def seed_revocations(total, batch_size=10000):
+    """
+    Top RevokedToken up to `total` unexpired rows.
+    """
+    expires_at = timezone.now() + timezone.timedelta(days=1)
+    missing = total - RevokedToken.objects.count()
+    while missing > 0:
+        size = min(batch_size, missing)
+        RevokedToken.objects.bulk_create([RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at) for _ in range(size)])
+        missing -= size
+
+
+def run_refresh_load(user, revoked_levels=(0, 10000, 100000), concurrency=10, requests=200):
+    from tracker.views import get_tokens_for_user
+
+    results = []
+    for level in revoked_levels:
+        seed_revocations(level)
+        revoked = RevokedToken.objects.count()
+        started = time.perf_counter()
+        bloom = revocation_store.rebuild()
+        rebuild_ms = (time.perf_counter() - started) * 1000
+        tokens = [get_tokens_for_user(user)['refresh'] for _ in range(requests)]
+        result = run_concurrent(reverse('token-refresh'), concurrency, requests, payloads=[{'refresh': token} for token in tokens])
+        replays = run_concurrent(reverse('token-refresh'), concurrency, requests, payloads=[{'refresh': token} for token in tokens])
+        results.append({
+            'revoked': revoked,
+            'filter_kib': round(len(bloom.bits) / 1024, 1),
+            'rebuild_ms': round(rebuild_ms, 1),
+            **result,
+            'replay_p95_ms': replays['p95_ms'],
+            'replays_rejected': replays['statuses'].get(401, 0),
+        })
+    return results
+
+
+# Search: FTS index vs a naive icontains scan
+SEARCH_QUERIES = (
+    ('rare serial', 'SN-0-12345'),
+    ('serial suffix', '2345'),
+    ('common name', 'Device'),
+    ('two terms', 'Device 0-99'),
+)
+
+
+def run_search_comparison(company, queries=SEARCH_QUERIES, iterations=20, limit=20):
+    """
+    Time the first page of results for each query through the FTS index and
+    through `icontains`, both in rank order.
+    """
+    from tracker.search import MAX_MATCHES, SEARCH_INDEXES, search_terms
+
+    index = SEARCH_INDEXES['devices']
+    methods = {
+        'fts': lambda terms: (index.count(company, terms), index.ids(company, terms, 0, limit)),
+        'icontains': lambda terms: (
+            min(index.scan(company, terms).count(), MAX_MATCHES),
+            list(index.scan(company, terms).values_list('pk', flat=True)[:limit]),
+        ),
+    }
+    results = []
+    for label, query in queries:
+        terms = search_terms(query)
+        for method, run in methods.items():
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                total, _ = run(terms)
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append({
+                'query': label,
+                'q': query,
+                'method': method,
+                'matches': total,
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+            })
+    return results
+
+
+# Serialization: model serializers vs compiled row plans
+SERIALIZATION_TARGETS = (
+    # (name, serializer in tracker.serializers, queryset for a company, select_related)
+    ('devices', 'DeviceSerializer', lambda company: Device.objects.filter(owner=company), ('owner__owner',)),
+    ('device-logs', 'DeviceLogSerializer', lambda company: DeviceLog.objects.filter(company=company), ()),
+)
+
+
+def run_serialization_comparison(company, sizes=(1000, 10000, 100000), repeat=3):
+    """
+    Rows per second from queryset to JSON bytes for `sizes` rows, through
+    the model serializer + JSONRenderer and through RowPlan +
+    FastJSONRenderer. The best of `repeat` runs is kept, and both paths
+    must produce the same bytes.
+    """
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from tracker import serializers
+    from tracker.rendering import FastJSONRenderer, RowPlan
+
+    context = {'request': Request(APIRequestFactory().get('/'))}
+    results = []
+    for name, serializer_name, queryset_for, select_related in SERIALIZATION_TARGETS:
+        serializer_class = getattr(serializers, serializer_name)
+        plan = RowPlan.compile(serializer_class(context=context))
+        queryset = queryset_for(company).order_by('-created_at', '-id')
+        paths = {
+            'serializer': lambda rows: JSONRenderer().render(
+                serializer_class(queryset.select_related(*select_related)[:rows], many=True, context=context).data
+            ),
+            'row-plan': lambda rows: FastJSONRenderer().render(
+                plan.to_representation(queryset.values(*plan.lookups)[:rows])
+            ),
+        }
+        for size in sizes:
+            bodies, best = {}, {}
+            for path, render in paths.items():
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    bodies[path] = render(size)
+                    timings.append(time.perf_counter() - started)
+                best[path] = min(timings)
+            rows = json.loads(bodies['serializer'])
+            for path in paths:
+                results.append({
+                    'target': name,
+                    'rows': len(rows),
+                    'path': path,
+                    'ms': round(best[path] * 1000, 1),
+                    'rows_per_s': round(len(rows) / best[path]),
+                    'bytes': len(bodies[path]),
+                    'identical': bodies[path] == bodies['serializer'],
+                })
+    return results
+
+
+# Webhooks: outbox dispatcher against local stub endpoints
+class StubWebhookServer:
+    """
+    Local HTTP endpoint recording the webhook batches it receives, with
+    their arrival time. The next `fail` requests are answered with 503.
+    """
+
+    def __init__(self, fail=0):
+        stub = self
+        self.fail = fail
+        self.requests = []  # (arrival time, headers, decoded body)
+        self.lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                with stub.lock:
+                    failing = stub.fail > 0
+                    if failing:
+                        stub.fail -= 1
+                    else:
+                        stub.requests.append((time.time(), dict(self.headers), json.loads(body)))
+                self.send_response(503 if failing else 204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}/hooks'
+
+    @property
+    def events(self):
+        with self.lock:
+            return [event for _, _, body in self.requests for event in body['events']]
+
+    def arrivals(self):
+        with self.lock:
+            return [(arrived, event) for arrived, _, body in self.requests for event in body['events']]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _lag_summary(stubs, created):
+    lags = [(arrived - created[event['id']]) * 1000 for stub in stubs for arrived, event in stub.arrivals()]
+    return round(percentile(lags, 50), 1), round(percentile(lags, 95), 1)
+
+
+def run_webhook_backlog(company, events=10000, endpoints=2, batch_sizes=(1, 10, 100)):
+    """
+    Drain a backlog of `events` outbox events to `endpoints` stub endpoints
+    at each batch size: delivered events per second and delivery lag.
+    """
+    from tracker.models import OutboxEvent, WebhookCursor
+    from tracker.outbox import CHECKED_OUT, Dispatcher
+
+    results = []
+    for batch_size in batch_sizes:
+        OutboxEvent.objects.all().delete()
+        WebhookCursor.objects.all().delete()
+        OutboxEvent.objects.bulk_create(
+            [OutboxEvent(company=company, type=CHECKED_OUT, payload={'device': i}) for i in range(events)], batch_size=1000,
+        )
+        created = {pk: at.timestamp() for pk, at in OutboxEvent.objects.values_list('pk', 'created_at')}
+        stubs = [StubWebhookServer() for _ in range(endpoints)]
+        for stub in stubs:
+            stub.__enter__()
+        try:
+            # The backlog is committed before the run starts: no grace needed.
+            dispatcher = Dispatcher(endpoints=[{'URL': stub.url} for stub in stubs], batch_size=batch_size, commit_grace=0)
+            started = time.perf_counter()
+            dispatcher.run(poll_interval=0.01, drain=True)
+            elapsed = time.perf_counter() - started
+        finally:
+            for stub in stubs:
+                stub.__exit__(None, None, None)
+        p50, p95 = _lag_summary(stubs, created)
+        results.append({
+            'mode': 'backlog',
+            'batch_size': batch_size,
+            'events': events,
+            'endpoints': endpoints,
+            'delivered': dispatcher.delivered,
+            'events_per_s': round(dispatcher.delivered / elapsed),
+            'lag_p50_ms': p50,
+            'lag_p95_ms': p95,
+        })
+    return results
+
+
+def run_webhook_live(company, rate=200, seconds=5, endpoints=2, batch_size=100, poll_interval=0.05):
+    """
+    Record `rate` events per second for `seconds` while the dispatcher runs
+    in a thread: steady-state delivery lag.
+    """
+    from tracker.models import OutboxEvent, WebhookCursor
+    from tracker.outbox import CHECKED_OUT, Dispatcher
+
+    OutboxEvent.objects.all().delete()
+    WebhookCursor.objects.all().delete()
+    stubs = [StubWebhookServer() for _ in range(endpoints)]
+    for stub in stubs:
+        stub.__enter__()
+    stop = threading.Event()
+    # One writer committing one INSERT at a time, so ids are visible in
+    # order; measure delivery lag without the grace period.
+    dispatcher = Dispatcher(endpoints=[{'URL': stub.url} for stub in stubs], batch_size=batch_size, commit_grace=0)
+
+    def dispatch():
+        try:
+            dispatcher.run(poll_interval=poll_interval, stop=stop)
+        finally:
+            connection.close()
+
+    worker = threading.Thread(target=dispatch)
+    worker.start()
+    created = {}
+    try:
+        per_tick = max(1, rate // 20)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            batch = OutboxEvent.objects.bulk_create(
+                [OutboxEvent(company=company, type=CHECKED_OUT, payload={'device': i}) for i in range(per_tick)]
+            )
+            created.update((event.pk, event.created_at.timestamp()) for event in batch)
+            time.sleep(1 / 20)
+        while sum(len(stub.events) for stub in stubs) < len(created) * endpoints and time.perf_counter() < deadline + 30:
+            time.sleep(poll_interval)
+    finally:
+        stop.set()
+        worker.join()
+        for stub in stubs:
+            stub.__exit__(None, None, None)
+    p50, p95 = _lag_summary(stubs, created)
+    return [{
+        'mode': 'live',
+        'batch_size': batch_size,
+        'events': len(created),
+        'endpoints': endpoints,
+        'delivered': dispatcher.delivered,
+        'events_per_s': round(dispatcher.delivered / seconds),
+        'lag_p50_ms': p50,
+        'lag_p95_ms': p95,
+    }]
+
+
+# Cold start: a fresh interpreter per run (tracker.coldstart), as an autoscaled worker starts
+STARTUP_PROFILES = ('assets_tracker.settings', 'assets_tracker.settings_api')
+
+
+def measure_startup(settings_module, entry='wsgi', path='/api/', runs=5):
+    """
+    Median import time of the entry point, time to its first response and
+    whole process time (interpreter start to exit) over `runs` processes,
+    with the modules the last one loaded.
+    """
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-m', 'tracker.coldstart', '--entry', entry, '--path', path],
+            cwd=settings.BASE_DIR, env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module},
+            capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if completed.returncode:
+            raise RuntimeError(f"{settings_module} ({entry}) failed to start:\n{completed.stderr}")
+        sample = json.loads(completed.stdout.splitlines()[-1])
+        sample['process_ms'] = elapsed
+        samples.append(sample)
+    return {
+        'settings': settings_module,
+        'entry': entry,
+        'status': samples[-1]['status'],
+        'import_ms': round(percentile([s['import_ms'] for s in samples], 50), 2),
+        'first_response_ms': round(percentile([s['first_response_ms'] for s in samples], 50), 2),
+        'process_ms': round(percentile([s['process_ms'] for s in samples], 50), 2),
+        'modules': len(samples[-1]['modules']),
+        'loaded': samples[-1]['modules'],
+    }
+
+
+def check_startup_budgets(results, budgets, timings=True):
+    """
+    `budgets`: {settings module: {entry: {"max_modules", "import_ms",
+    "first_response_ms", "forbidden_modules": [package, ...]}}}. With
+    `timings=False` the wall-clock budgets are skipped, leaving only the
+    checks that do not depend on how busy the machine is.
+    """
+    violations = []
+    for result in results:
+        label = f"{result['settings']} ({result['entry']})"
+        if result['status'] >= 400:
+            violations.append(f"{label}: first response {result['status']}")
+        budget = budgets.get(result['settings'], {}).get(result['entry'])
+        if budget is None:
+            continue
+        if 'max_modules' in budget and result['modules'] > budget['max_modules']:
+            violations.append(f"{label}: {result['modules']} modules > budget {budget['max_modules']}")
+        for key in ('import_ms', 'first_response_ms') if timings else ():
+            if key in budget and result[key] > budget[key]:
+                violations.append(f"{label}: {key} {result[key]} > budget {budget[key]}")
+        for package in budget.get('forbidden_modules', ()):
+            if any(name == package or name.startswith(f'{package}.') for name in result['loaded']):
+                violations.append(f"{label}: imports {package}")
+    return violations
+
+
+# Budgets
+def load_budgets(path=DEFAULT_BUDGETS_PATH):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def check_budgets(results, budgets):
+    violations = []
+    for result in results:
+        route = result['route']
+        bad_statuses = sorted(code for code in result['statuses'] if code >= 400)
+        if bad_statuses:
+            violations.append(f"{route}: unexpected status {bad_statuses}")
+        budget = budgets.get(route)
+        if budget is None:
+            violations.append(f"{route}: no budget committed")
+            continue
+        if 'max_queries' in budget and result['queries'] > budget['max_queries']:
+            violations.append(f"{route}: {result['queries']} queries > budget {budget['max_queries']}")
+        if 'p95_ms' in budget and result['p95_ms'] > budget['p95_ms']:
+            violations.append(f"{route}: p95 {result['p95_ms']}ms > budget {budget['p95_ms']}ms")
+        if 'max_bytes' in budget and result['bytes'] > budget['max_bytes']:
+            violations.append(f"{route}: {result['bytes']} bytes > budget {budget['max_bytes']}")
+    return violations
@@ -0,0 +1,91 @@
+"""
+Child process of `manage.py benchmark_startup`: imports the WSGI or ASGI
+entry point in a fresh interpreter, sends it one request and prints one
+JSON line:
+
+    {"entry": "wsgi", "status": 200, "import_ms": ..., "first_response_ms": ..., "modules": [...]}
+
+    python -m tracker.coldstart --entry asgi --path /api/
+
+Only the standard library is imported before the clock starts, and no
+database is needed as long as `path` does not query one.
+"""
+import argparse
+import importlib
+import io
+import json
+import sys
+import time
+
+ENTRY_POINTS = {'wsgi': 'assets_tracker.wsgi', 'asgi': 'assets_tracker.asgi'}
+
+
+def wsgi_request(application, path):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'localhost',
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b''.join(response)
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return int(statuses[0].split()[0])
+
+
+def asgi_request(application, path):
+    import asyncio
+
+    async def request():
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+            'headers': [(b'host', b'localhost')], 'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        }
+        messages = []
+        received = []
+
+        async def receive():
+            if not received:
+                received.append(True)
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # The client never disconnects; Django cancels this wait once the response is sent.
+            await asyncio.Future()
+
+        async def send(message):
+            messages.append(message)
+
+        await application(scope, receive, send)
+        return next(message['status'] for message in messages if message['type'] == 'http.response.start')
+
+    return asyncio.run(request())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entry', choices=sorted(ENTRY_POINTS), default='wsgi')
+    parser.add_argument('--path', default='/api/')
+    args = parser.parse_args(argv)
+
+    preloaded = set(sys.modules)
+    started = time.perf_counter()
+    application = importlib.import_module(ENTRY_POINTS[args.entry]).application
+    imported = time.perf_counter()
+    send = wsgi_request if args.entry == 'wsgi' else asgi_request
+    status = send(application, args.path)
+    responded = time.perf_counter()
+    print(json.dumps({
+        'entry': args.entry,
+        'status': status,
+        'import_ms': round((imported - started) * 1000, 2),
+        'first_response_ms': round((responded - imported) * 1000, 2),
+        'modules': sorted(set(sys.modules) - preloaded),
+    }))
+
+
+if __name__ == '__main__':
+    main()
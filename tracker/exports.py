@@ -0,0 +1,182 @@
+import csv
+import datetime
+import json
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import renderers, serializers
+
+from tracker.models import ArchivedDeviceLog, Device, DeviceLog, Employee
+
+EXPORT_CHUNK_SIZE = 2000
+LINES_PER_WRITE = 500
+
+
+# Renderers: used for content negotiation (`?format=csv` or an Accept header);
+# the export body itself is streamed, these only render error responses.
+class CSVRenderer(renderers.BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data.items() if isinstance(data, dict) else enumerate(data)
+        return ''.join(f'{key},{value}\n' for key, value in rows).encode(self.charset)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, default=str) + '\n').encode(self.charset)
+
+
+# Exported columns: (header, values_list lookup)
+DEVICE_LOG_COLUMNS = (
+    ('id', 'id'),
+    ('device', 'device_id'),
+    ('device_serial_no', 'device__serial_no'),
+    ('checked_out_by', 'checked_out_by_id'),
+    ('checked_out_by_email', 'checked_out_by__email'),
+    ('checked_out_condition', 'checked_out_condition'),
+    ('checked_in_condition', 'checked_in_condition'),
+    ('created_at', 'created_at'),
+    ('returned_at', 'returned_at'),
+)
+DEVICE_COLUMNS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('serial_no', 'serial_no'),
+    ('is_available', 'is_available'),
+    ('current_log', 'current_log_id'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+EMPLOYEE_COLUMNS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('email', 'email'),
+    ('address', 'address'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+
+def _parse_bound(value, name, end=False):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise serializers.ValidationError({name: "Enter a date or datetime in ISO 8601 format."})
+        parsed = datetime.datetime.combine(day, datetime.time.max if end else datetime.time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_id(value, name):
+    try:
+        return int(value)
+    except ValueError:
+        raise serializers.ValidationError({name: "A valid integer is required."})
+
+
+def filter_created(queryset, params):
+    """
+    Apply the `since` / `until` date-range filters on created_at.
+    """
+    if params.get('since'):
+        queryset = queryset.filter(created_at__gte=_parse_bound(params['since'], 'since'))
+    if params.get('until'):
+        queryset = queryset.filter(created_at__lte=_parse_bound(params['until'], 'until', end=True))
+    return queryset
+
+
+def _parse_bool(value, name):
+    if value.lower() in ('true', '1'):
+        return True
+    if value.lower() in ('false', '0'):
+        return False
+    raise serializers.ValidationError({name: "Must be a valid boolean."})
+
+
+def device_log_rows(company, params):
+    # Recent loans by default; `archived=true` exports the archive table instead.
+    if params.get('archived') and _parse_bool(params['archived'], 'archived'):
+        queryset = ArchivedDeviceLog.objects.filter(company=company)
+    else:
+        queryset = DeviceLog.objects.filter(company=company)
+    queryset = filter_created(queryset, params)
+    if params.get('device'):
+        queryset = queryset.filter(device_id=_parse_id(params['device'], 'device'))
+    if params.get('employee'):
+        queryset = queryset.filter(checked_out_by_id=_parse_id(params['employee'], 'employee'))
+    return DEVICE_LOG_COLUMNS, queryset
+
+
+def device_rows(company, params):
+    return DEVICE_COLUMNS, filter_created(Device.objects.filter(owner=company), params)
+
+
+def employee_rows(company, params):
+    return EMPLOYEE_COLUMNS, filter_created(Employee.objects.filter(company=company), params)
+
+
+# Streaming
+def iter_values(columns, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield plain tuples in primary key order without building model instances.
+
+    `iterator()` reads the result in chunks (server-side cursors where the
+    backend has them), so memory stays flat however large the export is.
+    """
+    lookups = [lookup for _, lookup in columns]
+    for row in queryset.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size):
+        yield tuple(_plain(value) for value in row)
+
+
+def _plain(value):
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).isoformat()
+    return value
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _batched(lines, size=LINES_PER_WRITE):
+    # Hand the server a few hundred lines per write rather than one.
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def stream_csv(columns, queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in columns])
+    yield from _batched(writer.writerow(row) for row in iter_values(columns, queryset))
+
+
+def stream_ndjson(columns, queryset):
+    headers = [header for header, _ in columns]
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield from _batched(encoder.encode(dict(zip(headers, row))) + '\n' for row in iter_values(columns, queryset))
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
@@ -0,0 +1,90 @@
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+class Fieldset(namedtuple('Fieldset', ['fields', 'expand'])):
+    """
+    What a read asked for: `?fields=id,name` (None keeps every field) and
+    `?expand=owner` (nested relations to embed; the others render as
+    primary keys). Expanded relations are selected even when not listed.
+    """
+
+    def select_related(self, paths):
+        """
+        Keep the join paths whose first relation is expanded.
+        """
+        return tuple(path for path in paths if path.split('__')[0] in self.expand)
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def parse_fieldset(query_params):
+    """
+    The requested Fieldset, or None when neither parameter is given and the
+    full representation (nested relations included) is wanted.
+    """
+    fields = _split(query_params.get(FIELDS_PARAM, ''))
+    expand = _split(query_params.get(EXPAND_PARAM, ''))
+    if not fields and not expand:
+        return None
+    return Fieldset(fields | expand if fields else None, expand)
+
+
+def only_fields(serializer, extra=()):
+    """
+    The model columns the (already narrowed) serializer reads, for
+    `QuerySet.only()`. `extra` adds columns the view needs itself, such as
+    the pagination ordering.
+    """
+    model = serializer.Meta.model
+    names = {model._meta.pk.name}
+    for field in serializer.fields.values():
+        if field.source != '*':
+            names.add(field.source.split('.')[0])
+    names.update(name.lstrip('-') for name in extra)
+    columns = []
+    for name in sorted(names):
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if model_field.concrete and not model_field.many_to_many:
+            columns.append(name)
+    return columns
+
+
+class FieldsetSerializerMixin:
+    """
+    Narrows a ModelSerializer to the Fieldset found in its context under
+    'fieldset': unrequested fields are dropped and nested serializers that
+    are not expanded become primary keys, so they need no join.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get('fieldset')
+        if fieldset is not None:
+            self.apply_fieldset(fieldset)
+
+    def apply_fieldset(self, fieldset):
+        expandable = {name for name, field in self.fields.items() if isinstance(field, serializers.BaseSerializer)}
+        errors = {}
+        if fieldset.fields is not None and fieldset.fields - set(self.fields):
+            errors[FIELDS_PARAM] = [f"Unknown field: {name}." for name in sorted(fieldset.fields - set(self.fields))]
+        if fieldset.expand - expandable:
+            errors[EXPAND_PARAM] = [f"Cannot expand: {name}." for name in sorted(fieldset.expand - expandable)]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        for name in list(self.fields):
+            if fieldset.fields is not None and name not in fieldset.fields:
+                self.fields.pop(name)
+            elif name in expandable and name not in fieldset.expand:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
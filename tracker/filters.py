@@ -0,0 +1,99 @@
+from django.db.models import Value
+from django_filters import rest_framework as filters
+
+from tracker.models import ArchivedDeviceLog, Device, DeviceLog, Employee
+
+# Sorts after any character a prefix can be followed by.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+class PrefixFilter(filters.CharFilter):
+    """
+    Case-sensitive prefix match written as a range,
+    `value <= column < value + U+10FFFF`, so a B-tree index on the column
+    serves it; `LIKE 'value%'` cannot use one on SQLite's default collation.
+    """
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.filter(**{
+            f'{self.field_name}__gte': value,
+            f'{self.field_name}__lt': value + PREFIX_UPPER_BOUND,
+        })
+
+
+class BooleanEqualsFilter(filters.BooleanFilter):
+    """
+    `column = 1` rather than Django's bare `WHERE column` for True, which
+    SQLite cannot match against an index.
+    """
+
+    def filter(self, qs, value):
+        if value is None:
+            return qs
+        return qs.filter(**{self.field_name: Value(value)})
+
+
+# Every combination below is served by a composite index declared on the
+# model (the tenant column first, then the filtered column, then the
+# default ordering). Add the index when adding a filter.
+class DeviceFilter(filters.FilterSet):
+    """
+    ?is_available=      -> device_owner_available_idx (owner, is_available, created_at)
+    ?name=<prefix>      -> device_owner_name_idx (owner, name)
+    ?serial_no=<prefix> -> device_owner_serial_idx (owner, serial_no)
+    """
+    is_available = BooleanEqualsFilter()
+    name = PrefixFilter()
+    serial_no = PrefixFilter()
+
+    class Meta:
+        model = Device
+        fields = ['is_available', 'name', 'serial_no']
+
+
+class EmployeeFilter(filters.FilterSet):
+    """
+    ?name=<prefix>  -> employee_company_name_idx (company, name)
+    ?email=<prefix> -> employee_company_email_idx (company, email)
+    """
+    name = PrefixFilter()
+    email = PrefixFilter()
+
+    class Meta:
+        model = Employee
+        fields = ['name', 'email']
+
+
+class DeviceLogFilter(filters.FilterSet):
+    """
+    ?device=            -> devicelog_device_created_idx (company, device, created_at)
+    ?employee=          -> devicelog_employee_created_idx (company, checked_out_by, created_at)
+    ?created_after= / ?created_before= -> devicelog_company_created_idx (company, created_at)
+    ?open=true          -> devicelog_company_open_idx (company, created_at) WHERE returned_at IS NULL
+    ?open=false         -> devicelog_company_created_idx, filtered on returned_at
+    """
+    device = filters.NumberFilter(field_name='device_id')
+    employee = filters.NumberFilter(field_name='checked_out_by_id')
+    created_after = filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lte')
+    open = filters.BooleanFilter(field_name='returned_at', lookup_expr='isnull')
+
+    class Meta:
+        model = DeviceLog
+        fields = ['device', 'employee', 'created_after', 'created_before', 'open']
+
+
+class ArchivedDeviceLogFilter(DeviceLogFilter):
+    """
+    The DeviceLogFilter parameters on the archive (every loan there is closed):
+
+    ?device=            -> archivedlog_device_idx (company, device, created_at, id)
+    ?employee=          -> archivedlog_employee_idx (company, checked_out_by, created_at, id)
+    ?created_after= / ?created_before= -> archivedlog_company_idx (company, created_at, id)
+    """
+
+    class Meta:
+        model = ArchivedDeviceLog
+        fields = ['device', 'employee', 'created_after', 'created_before', 'open']
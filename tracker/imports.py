@@ -0,0 +1,154 @@
+import csv
+import io
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from tracker.models import Device, Employee
+from tracker.versioning import bump_company_version
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class Importer:
+    """
+    Streams a CSV into `model` in batches.
+
+    Each batch is validated with one uniqueness query and written with one
+    bulk_create in its own transaction, so a failed or interrupted import can
+    be resumed from `next_line` without re-inserting committed rows.
+    """
+    model = None
+    company_field = None
+    unique_field = None
+    required = ()
+    max_lengths = {}
+
+    def __init__(self, company, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+        self.company = company
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+        self.next_line = None
+
+    def run(self, stream, start_line=0):
+        """
+        Import from a text stream; data lines at or before `start_line` are skipped.
+        """
+        reader = csv.DictReader(stream)
+        missing = [column for column in self.required if column not in (reader.fieldnames or [])]
+        if missing:
+            self.add_error(1, {column: "Missing column." for column in missing})
+            return self.summary()
+
+        batch = []
+        for row in reader:
+            if reader.line_num <= start_line:
+                continue
+            batch.append((reader.line_num, row))
+            if len(batch) >= self.batch_size:
+                if not self.flush(batch):
+                    return self.summary()
+                batch = []
+        if batch:
+            self.flush(batch)
+        return self.summary()
+
+    def flush(self, batch):
+        objects, seen = [], set()
+        # One query tells us which keys in this batch already exist.
+        keys = {(row.get(self.unique_field) or '').strip() for _, row in batch}
+        existing = set(
+            self.model.objects.filter(**{f'{self.unique_field}__in': keys}).values_list(self.unique_field, flat=True)
+        )
+        for line, row in batch:
+            values, errors = self.clean(row)
+            key = values.get(self.unique_field)
+            if key and (key in existing or key in seen):
+                errors[self.unique_field] = f"{self.unique_field} already exists."
+            if errors:
+                self.add_error(line, errors)
+                continue
+            seen.add(key)
+            objects.append(self.model(**values, **{self.company_field: self.company}))
+
+        try:
+            with transaction.atomic():
+                if objects:
+                    self.model.objects.bulk_create(objects)
+                    bump_company_version(self.company.pk)
+        except IntegrityError:
+            # A concurrent writer took one of the keys; nothing from this batch was written.
+            self.add_error(batch[0][0], {'batch': "Conflicting rows were written concurrently; resume from this line."})
+            self.next_line = batch[0][0] - 1
+            return False
+        self.created += len(objects)
+        self.next_line = batch[-1][0]
+        if self.on_batch:
+            self.on_batch(self.summary())
+        return True
+
+    def clean(self, row):
+        values, errors = {}, {}
+        for column in self.required:
+            value = (row.get(column) or '').strip()
+            if not value:
+                errors[column] = "This field is required."
+            elif len(value) > self.max_lengths.get(column, 255):
+                errors[column] = f"Ensure this field has no more than {self.max_lengths.get(column, 255)} characters."
+            values[column] = value
+        return values, errors
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def summary(self):
+        return {
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'next_line': self.next_line,
+        }
+
+
+class EmployeeImporter(Importer):
+    model = Employee
+    company_field = 'company'
+    unique_field = 'email'
+    required = ('name', 'email', 'address')
+    max_lengths = {'email': 254}
+
+    def clean(self, row):
+        values, errors = super().clean(row)
+        if values.get('email') and 'email' not in errors:
+            try:
+                validate_email(values['email'])
+            except ValidationError:
+                errors['email'] = "Enter a valid email address."
+        return values, errors
+
+
+class DeviceImporter(Importer):
+    model = Device
+    company_field = 'owner'
+    unique_field = 'serial_no'
+    required = ('name', 'serial_no')
+
+
+IMPORTERS = {
+    'employees': EmployeeImporter,
+    'devices': DeviceImporter,
+}
+
+
+def text_stream(binary_file):
+    """
+    Decode an uploaded (binary) file lazily, tolerating a UTF-8 BOM.
+    """
+    return io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
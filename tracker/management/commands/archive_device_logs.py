@@ -0,0 +1,50 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move device logs closed longer ago than the archive window (TRACKER_ARCHIVE['AFTER_DAYS']) "
+        "into the archive table, in short batches. With --loop, repeat until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--after-days', type=int, help="Archive loans returned more than this many days ago.")
+        parser.add_argument('--batch-size', type=int, help="Rows moved per transaction.")
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches.")
+        parser.add_argument('--pause', type=float, default=None, help="Seconds to sleep between batches.")
+        parser.add_argument('--loop', action='store_true', help="Keep running, archiving every --interval seconds.")
+        parser.add_argument('--interval', type=float, help="Seconds between runs with --loop (default: TRACKER_ARCHIVE['INTERVAL']).")
+
+    def handle(self, *args, **options):
+        if options['after_days'] is not None and options['after_days'] < 0:
+            raise CommandError("--after-days must not be negative.")
+        if any(options[name] is not None and options[name] < 1 for name in ('batch_size', 'max_batches')):
+            raise CommandError("--batch-size and --max-batches must be positive.")
+        pause = options['pause'] if options['pause'] is not None else archive.archive_options().get('PAUSE', 0.0)
+        run_options = {
+            'after_days': options['after_days'], 'batch_size': options['batch_size'],
+            'max_batches': options['max_batches'], 'pause': pause,
+        }
+        if options['loop']:
+            return self.loop(options['interval'] or archive.archive_options().get('INTERVAL'), run_options)
+        moved = archive.archive_closed_logs(
+            on_batch=lambda total: self.stdout.write(f"{total} rows archived..."), **run_options,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} closed device logs."))
+
+    def loop(self, interval, run_options):
+        if not interval or interval <= 0:
+            raise CommandError("--loop needs a positive --interval or TRACKER_ARCHIVE['INTERVAL'].")
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        self.stdout.write(f"Archiving every {interval:g}s until interrupted.")
+        archive.run_periodically(
+            interval, stop=stop,
+            on_run=lambda moved: self.stdout.write(f"Archived {moved} closed device logs."), **run_options,
+        )
@@ -0,0 +1,90 @@
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database, hit every route in tracker/urls.py and report "
+        "p50/p95 latency, SQL query count and response size, then measure cold starts (benchmark_startup). "
+        "Fails when a committed budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, help="Number of tenants to seed.")
+        parser.add_argument('--employees', type=int, help="Employees per tenant.")
+        parser.add_argument('--devices', type=int, help="Devices per tenant.")
+        parser.add_argument('--logs', type=int, help="DeviceLog rows per device.")
+        parser.add_argument('--iterations', type=int, default=20, help="Measured requests per route.")
+        parser.add_argument('--warmup', type=int, default=2, help="Unmeasured requests per route.")
+        parser.add_argument('--budgets', default=str(benchmark.DEFAULT_BUDGETS_PATH), help="Budget file to check against.")
+        parser.add_argument('--no-budgets', action='store_true', help="Only report, never fail.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+        parser.add_argument('--startup-runs', type=int, default=5, help="Processes started per profile and entry point.")
+        parser.add_argument('--skip-startup', action='store_true', help="Do not measure cold starts.")
+
+    def handle(self, *args, **options):
+        budgets = {} if options['no_budgets'] else benchmark.load_budgets(options['budgets'])
+        dataset_options = dict(budgets.get('dataset', {}))
+        for key in ('companies', 'employees', 'devices', 'logs'):
+            if options[key] is not None:
+                dataset_options[key] = options[key]
+        iterations, warmup = options['iterations'], options['warmup']
+
+        # Never benchmark against the real database: build a disposable test database instead.
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(pool=iterations + warmup, **dataset_options)
+            scenarios = benchmark.build_scenarios(dataset)
+            results = benchmark.run_scenarios(scenarios, iterations=iterations, warmup=warmup)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'dataset': dataset_options, 'results': results}, fh, indent=2)
+
+        unbenchmarked = benchmark.tracker_route_names() - set(scenarios)
+        for name in sorted(unbenchmarked):
+            self.stderr.write(self.style.WARNING(f"Route '{name}' has no benchmark scenario."))
+
+        violations = [] if options['no_budgets'] else benchmark.check_budgets(results, budgets.get('routes', {}))
+        for violation in violations:
+            self.stderr.write(self.style.ERROR(violation))
+
+        # The startup ms budgets live here rather than in the test suite: wall-clock
+        # numbers are only meaningful on a quiet machine.
+        startup_error = None
+        if not options['skip_startup']:
+            try:
+                call_command(
+                    'benchmark_startup', runs=options['startup_runs'], budgets=options['budgets'],
+                    no_budgets=options['no_budgets'], stdout=self.stdout._out, stderr=self.stderr._out,
+                )
+            except CommandError as e:
+                startup_error = e
+
+        if violations:
+            raise CommandError(f"{len(violations)} benchmark budget(s) exceeded.")
+        if startup_error:
+            raise startup_error
+        if not options['no_budgets']:
+            self.stdout.write(self.style.SUCCESS("All routes within budget."))
+
+    def report(self, results):
+        header = f"{'route':<24}{'method':<8}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'bytes':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['route']:<24}{row['method']:<8}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+                f"{row['queries']:>9}{row['bytes']:>10}"
+            )
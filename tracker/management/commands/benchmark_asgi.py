@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark
+from tracker.views import get_tokens_for_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and compare requests per second and tail latency of the "
+        "sync DRF read views and their async counterparts under concurrent ASGI clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, help="Number of tenants to seed.")
+        parser.add_argument('--employees', type=int, help="Employees per tenant.")
+        parser.add_argument('--devices', type=int, help="Devices per tenant.")
+        parser.add_argument('--logs', type=int, help="DeviceLog rows per device.")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50], help="Concurrent clients to test with.")
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per route, mode and concurrency.")
+        parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per route and mode.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if min(options['concurrency']) < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+        dataset_options = dict(benchmark.load_budgets().get('dataset', {}))
+        for key in ('companies', 'employees', 'devices', 'logs'):
+            if options[key] is not None:
+                dataset_options[key] = options[key]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(**dataset_options)
+            token = get_tokens_for_user(dataset['user'])['access']
+            results = benchmark.run_asgi_comparison(
+                benchmark.build_scenarios(dataset), token,
+                concurrency_levels=options['concurrency'], requests=options['requests'], warmup=options['warmup'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'dataset': dataset_options, 'results': results}, fh, indent=2)
+        failed = [row for row in results if any(code >= 400 for code in row['statuses'])]
+        if failed:
+            raise CommandError(f"{len(failed)} run(s) returned error statuses.")
+
+    def report(self, results):
+        header = f"{'route':<24}{'mode':<7}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['route']:<24}{row['mode']:<7}{row['concurrency']:>8}{row['rps']:>10}"
+                f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+            )
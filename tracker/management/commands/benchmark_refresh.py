@@ -0,0 +1,55 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and measure the token refresh endpoint under concurrent "
+        "ASGI clients as the revocation table grows, including replays of rotated tokens."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--revoked', type=int, nargs='+', default=[0, 10000, 100000], help="Revocation table sizes to test at.")
+        parser.add_argument('--concurrency', type=int, default=10, help="Concurrent clients.")
+        parser.add_argument('--requests', type=int, default=200, help="Refreshes per table size.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+
+        # Replays are rejected on purpose; keep their 401 warnings out of the report.
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(companies=1, employees=0, devices=0, logs=0)
+            results = benchmark.run_refresh_load(
+                dataset['user'], revoked_levels=sorted(options['revoked']),
+                concurrency=options['concurrency'], requests=options['requests'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        header = f"{'revoked':>10}{'filter KiB':>12}{'rebuild ms':>12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'replay p95':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['revoked']:>10}{row['filter_kib']:>12}{row['rebuild_ms']:>12}{row['rps']:>10}"
+                f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['replay_p95_ms']:>12}"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'results': results}, fh, indent=2)
+
+        failed = [row for row in results if set(row['statuses']) != {200} or row['replays_rejected'] != options['requests']]
+        if failed:
+            raise CommandError("Some refreshes failed or some replays were accepted.")
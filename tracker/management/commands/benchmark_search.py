@@ -0,0 +1,44 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed one large tenant in a throwaway database and compare device search through "
+        "the FTS index with a naive icontains scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--devices', type=int, default=100000, help="Devices in the searched tenant.")
+        parser.add_argument('--iterations', type=int, default=20, help="Timed runs per query and method.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("The search index is only built on SQLite; other backends always scan.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(companies=2, employees=0, devices=options['devices'], logs=0)
+            results = benchmark.run_search_comparison(dataset['company'], iterations=options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        header = f"{'query':<16}{'q':<14}{'method':<11}{'matches':>9}{'p50 ms':>10}{'p95 ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['query']:<16}{row['q']:<14}{row['method']:<11}{row['matches']:>9}"
+                f"{row['p50_ms']:>10}{row['p95_ms']:>10}"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'devices': options['devices'], 'results': results}, fh, indent=2)
@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark, rendering
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed one large tenant in a throwaway database and compare list serialization "
+        "through the model serializers with the compiled row plans (TRACKER_FAST_LISTS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help="Rows per measurement.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per size and path; the best is kept.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if min(options['rows']) < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(companies=1, employees=1, devices=max(options['rows']), logs=1)
+            results = benchmark.run_serialization_comparison(
+                dataset['company'], sizes=sorted(options['rows']), repeat=options['repeat'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        header = f"{'target':<13}{'rows':>8}  {'path':<12}{'ms':>10}{'rows/s':>11}{'bytes':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['target']:<13}{row['rows']:>8}  {row['path']:<12}{row['ms']:>10}{row['rows_per_s']:>11}{row['bytes']:>12}"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'results': results}, fh, indent=2)
+
+        if rendering.orjson is None:
+            self.stderr.write(self.style.WARNING(
+                "orjson is not installed: the fast path encoded with the standard json module (pip install orjson)."
+            ))
+        if not all(row['identical'] for row in results):
+            raise CommandError("The row plan output differs from the serializer output.")
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Start fresh worker processes through assets_tracker/wsgi.py and asgi.py and report the import time, "
+        "time to the first response and modules loaded per settings profile. Fails when a startup budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=list(benchmark.STARTUP_PROFILES),
+            help="Settings modules to start with.",
+        )
+        parser.add_argument('--entries', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+        parser.add_argument('--path', default='/api/', help="URL of the first request; it should not need the database.")
+        parser.add_argument('--runs', type=int, default=5, help="Processes started per profile and entry point.")
+        parser.add_argument('--budgets', default=str(benchmark.DEFAULT_BUDGETS_PATH), help="Budget file to check against.")
+        parser.add_argument('--no-budgets', action='store_true', help="Only report, never fail.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be positive.")
+        try:
+            results = [
+                benchmark.measure_startup(profile, entry, options['path'], options['runs'])
+                for profile in options['profiles'] for entry in options['entries']
+            ]
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'path': options['path'], 'runs': options['runs'], 'results': results}, fh, indent=2)
+
+        if options['no_budgets']:
+            return
+        budgets = benchmark.load_budgets(options['budgets']).get('startup', {})
+        violations = benchmark.check_startup_budgets(results, budgets)
+        if violations:
+            for violation in violations:
+                self.stderr.write(self.style.ERROR(violation))
+            raise CommandError(f"{len(violations)} startup budget(s) exceeded.")
+        self.stdout.write(self.style.SUCCESS("Startup within budget."))
+
+    def report(self, results):
+        header = f"{'settings':<30}{'entry':<7}{'import ms':>11}{'first resp ms':>15}{'process ms':>12}{'modules':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['settings']:<30}{row['entry']:<7}{row['import_ms']:>11}{row['first_response_ms']:>15}"
+                f"{row['process_ms']:>12}{row['modules']:>9}"
+            )
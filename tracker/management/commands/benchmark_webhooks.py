@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure webhook delivery from the outbox to local stub endpoints in a throwaway database: "
+        "events per second draining a backlog per batch size, and delivery lag under a steady event rate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=10000, help="Backlog size to drain.")
+        parser.add_argument('--endpoints', type=int, default=2, help="Stub endpoints receiving every event.")
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100], help="Batch sizes to compare.")
+        parser.add_argument('--rate', type=int, default=200, help="Events per second recorded during the live run.")
+        parser.add_argument('--seconds', type=float, default=5, help="Length of the live run.")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        if min(options['batch_sizes']) < 1 or min(options['events'], options['endpoints'], options['rate']) < 1:
+            raise CommandError("--events, --endpoints, --rate and --batch-sizes must be positive.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            dataset = benchmark.seed_dataset(companies=1, employees=1, devices=1, logs=1)
+            results = benchmark.run_webhook_backlog(
+                dataset['company'], events=options['events'], endpoints=options['endpoints'],
+                batch_sizes=options['batch_sizes'],
+            )
+            results += benchmark.run_webhook_live(
+                dataset['company'], rate=options['rate'], seconds=options['seconds'], endpoints=options['endpoints'],
+                batch_size=max(options['batch_sizes']),
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        header = f"{'mode':<9}{'batch':>7}{'events':>9}{'delivered':>11}{'events/s':>10}{'lag p50 ms':>12}{'lag p95 ms':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:<9}{row['batch_size']:>7}{row['events']:>9}{row['delivered']:>11}"
+                f"{row['events_per_s']:>10}{row['lag_p50_ms']:>12}{row['lag_p95_ms']:>12}"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'results': results}, fh, indent=2)
@@ -0,0 +1,33 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver outbox events (device check-outs and check-ins) to the webhook endpoints in "
+        "TRACKER_WEBHOOKS, in batches and in order per endpoint. Runs until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to wait when there is nothing to send.")
+        parser.add_argument('--drain', action='store_true', help="Exit once a pass has nothing to send.")
+
+    def handle(self, *args, **options):
+        if not outbox.webhook_endpoints():
+            raise CommandError("No endpoints in TRACKER_WEBHOOKS['ENDPOINTS'].")
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        dispatcher = outbox.Dispatcher()
+        dispatcher.run(poll_interval=options['poll_interval'], stop=stop, drain=options['drain'])
+        stats = dispatcher.stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Delivered {stats['delivered']} events in {stats['batches']} batches ({stats['failures']} failed attempts)."
+        ))
+        for url, lag in stats['lag'].items():
+            self.stdout.write(f"{url}: {lag:.1f}s behind")
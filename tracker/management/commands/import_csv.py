@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import imports
+from tracker.models import Company
+
+
+class Command(BaseCommand):
+    help = "Import employees or devices for a company from a CSV file, in batches. Resume with --start-line."
+
+    def add_arguments(self, parser):
+        parser.add_argument('company', type=int, help="Company id.")
+        parser.add_argument('kind', choices=sorted(imports.IMPORTERS))
+        parser.add_argument('path', help="CSV file with a header row.")
+        parser.add_argument('--start-line', type=int, default=0, help="Skip data lines up to and including this line.")
+        parser.add_argument('--batch-size', type=int, default=imports.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            company = Company.objects.get(pk=options['company'])
+        except Company.DoesNotExist:
+            raise CommandError(f"Company {options['company']} does not exist.")
+
+        def progress(summary):
+            self.stdout.write(f"line {summary['next_line']}: {summary['created']} created, {summary['error_count']} errors")
+
+        importer = imports.IMPORTERS[options['kind']](company, batch_size=options['batch_size'], on_batch=progress)
+        with open(options['path'], 'rb') as fh:
+            summary = importer.run(imports.text_stream(fh), start_line=options['start_line'])
+
+        for error in summary['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} created, {summary['error_count']} errors, resume with --start-line {summary['next_line']}"
+        ))
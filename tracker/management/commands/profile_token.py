@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tracker import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a signed X-Tracker-Profile header value. Requests sending it log their slow SQL "
+        "statements with EXPLAIN output, until it expires (TRACKER_SLOW_QUERIES['HEADER_MAX_AGE'])."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{profiling.PROFILE_HEADER}: {profiling.make_profile_token()}")
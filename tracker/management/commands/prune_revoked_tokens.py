@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tracker import revocation
+
+
+class Command(BaseCommand):
+    help = "Delete revoked refresh tokens that have expired (they can no longer be used anyway)."
+
+    def handle(self, *args, **options):
+        deleted = revocation.prune_expired()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired revocations."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from tracker import analytics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day device and employee usage rollups from DeviceLog history."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, action='append', dest='companies', help="Only rebuild this company (repeatable).")
+        parser.add_argument('--chunk-size', type=int, default=analytics.BACKFILL_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rebuilt = analytics.rebuild_rollups(options['companies'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups from {rebuilt} device log rows."))
@@ -0,0 +1,265 @@
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_FLUSH_INTERVAL = 5.0
+UNMATCHED_ROUTE = 'unmatched'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_options():
+    return getattr(settings, 'TRACKER_METRICS', {})
+
+
+def metrics_enabled():
+    return metrics_options().get('ENABLED', True)
+
+
+# Per-thread counters
+class RouteStats:
+    """
+    Counters of one (route, method) pair. Each thread updates its own
+    instances, so increments need no lock.
+    """
+
+    __slots__ = ('buckets', 'duration', 'count', 'queries', 'query_duration', 'response_bytes', 'statuses')
+
+    def __init__(self, size):
+        self.buckets = [0] * size  # one per bound, then +Inf; not cumulative
+        self.duration = 0.0
+        self.count = 0
+        self.queries = 0
+        self.query_duration = 0.0
+        self.response_bytes = 0
+        self.statuses = {}
+
+    def dump(self):
+        return {
+            'buckets': self.buckets, 'duration': self.duration, 'count': self.count, 'queries': self.queries,
+            'query_duration': self.query_duration, 'response_bytes': self.response_bytes,
+            'statuses': {str(code): n for code, n in self.statuses.items()},
+        }
+
+
+class Registry:
+    """
+    Request metrics of this process.
+
+    Every thread writes to its own dict of RouteStats (registered once),
+    and a scrape sums them; with TRACKER_METRICS['MULTIPROCESS_DIR'] set,
+    each process also writes its totals to `<dir>/<pid>.json` at most every
+    FLUSH_INTERVAL seconds, and a scrape merges the other processes' files.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, directory=None, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.bounds = tuple(buckets)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._stores = []
+        self._stores_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _store(self):
+        try:
+            return self._local.store
+        except AttributeError:
+            store = self._local.store = {}
+            with self._stores_lock:
+                self._stores.append(store)
+            return store
+
+    def observe(self, route, method, status, duration, response_bytes=0, queries=0, query_duration=0.0):
+        store = self._store()
+        stats = store.get((route, method))
+        if stats is None:
+            stats = store[(route, method)] = RouteStats(len(self.bounds) + 1)
+        stats.buckets[bisect_left(self.bounds, duration)] += 1
+        stats.duration += duration
+        stats.count += 1
+        stats.queries += queries
+        stats.query_duration += query_duration
+        stats.response_bytes += response_bytes
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if self.directory and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+
+    def snapshot(self):
+        """
+        {(route, method): dumped RouteStats} summed over the threads of this process.
+        """
+        with self._stores_lock:
+            stores = list(self._stores)
+        totals = {}
+        for store in stores:
+            for key, stats in list(store.items()):
+                merge(totals, key, stats.dump())
+        return totals
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        rows = [[route, method, data] for (route, method), data in self.snapshot().items()]
+        with open(f'{path}.tmp', 'w') as fh:
+            json.dump(rows, fh)
+        os.replace(f'{path}.tmp', path)
+
+    def collect(self):
+        """
+        Totals of this process plus, in multi-process mode, the last flush
+        of every other process (including exited ones: counters never go back).
+        """
+        totals = self.snapshot()
+        if not self.directory or not os.path.isdir(self.directory):
+            return totals
+        own = f'{os.getpid()}.json'
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json') or name == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as fh:
+                    rows = json.load(fh)
+            except (OSError, ValueError):
+                continue
+            for route, method, data in rows:
+                merge(totals, (route, method), data)
+        return totals
+
+    def clear(self):
+        with self._stores_lock:
+            for store in self._stores:
+                store.clear()
+
+
+def merge(totals, key, data):
+    current = totals.get(key)
+    if current is None:
+        totals[key] = {**data, 'buckets': list(data['buckets']), 'statuses': dict(data['statuses'])}
+        return
+    current['buckets'] = [a + b for a, b in zip(current['buckets'], data['buckets'])]
+    for name in ('duration', 'count', 'queries', 'query_duration', 'response_bytes'):
+        current[name] += data[name]
+    for code, n in data['statuses'].items():
+        current['statuses'][code] = current['statuses'].get(code, 0) + n
+
+
+def _build_registry():
+    options = metrics_options()
+    return Registry(
+        buckets=options.get('BUCKETS', DEFAULT_BUCKETS),
+        directory=options.get('MULTIPROCESS_DIR'),
+        flush_interval=options.get('FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL),
+    )
+
+
+registry = _build_registry()
+if registry.directory:
+    atexit.register(registry.flush)
+
+
+# SQL timing: one execute wrapper per connection, reporting to the current request
+class QueryStats:
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+current_queries = contextvars.ContextVar('tracker_metrics_queries', default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    stats = current_queries.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    connection_created receiver. A context variable rather than a
+    per-request wrapper, so queries an async view runs in sync_to_async
+    threads are counted too.
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+# Exposition
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render(totals, bounds):
+    """
+    Totals in the Prometheus text exposition format (version 0.0.4).
+    """
+    lines = []
+    rows = sorted(totals.items())
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family('tracker_http_request_duration_seconds', 'histogram', 'Time spent producing the response, by route.')
+    for (route, method), data in rows:
+        cumulative = 0
+        for bound, n in zip(bounds + (float('inf'),), data['buckets']):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else _number(float(bound))
+            lines.append(f'tracker_http_request_duration_seconds_bucket{{{_labels(route=route, method=method, le=le)}}} {cumulative}')
+        labels = _labels(route=route, method=method)
+        lines.append(f'tracker_http_request_duration_seconds_sum{{{labels}}} {_number(data["duration"])}')
+        lines.append(f'tracker_http_request_duration_seconds_count{{{labels}}} {data["count"]}')
+
+    family('tracker_http_requests_total', 'counter', 'Responses by route and status code.')
+    for (route, method), data in rows:
+        for code, n in sorted(data['statuses'].items()):
+            lines.append(f'tracker_http_requests_total{{{_labels(route=route, method=method, status=code)}}} {n}')
+
+    family('tracker_http_response_size_bytes', 'summary', 'Response body size, by route.')
+    for (route, method), data in rows:
+        labels = _labels(route=route, method=method)
+        lines.append(f'tracker_http_response_size_bytes_sum{{{labels}}} {data["response_bytes"]}')
+        lines.append(f'tracker_http_response_size_bytes_count{{{labels}}} {data["count"]}')
+
+    family('tracker_db_queries_total', 'counter', 'SQL queries run while handling requests, by route.')
+    for (route, method), data in rows:
+        lines.append(f'tracker_db_queries_total{{{_labels(route=route, method=method)}}} {data["queries"]}')
+
+    family('tracker_db_query_duration_seconds_total', 'counter', 'Time spent in SQL queries, by route.')
+    for (route, method), data in rows:
+        lines.append(f'tracker_db_query_duration_seconds_total{{{_labels(route=route, method=method)}}} {_number(data["query_duration"])}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    GET /metrics. Open unless TRACKER_METRICS['TOKEN'] is set, in which
+    case the scraper must send `Authorization: Bearer <token>`.
+    """
+    token = metrics_options().get('TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(render(registry.collect(), registry.bounds), content_type=CONTENT_TYPE)
@@ -0,0 +1,191 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from rest_framework.permissions import SAFE_METHODS
+
+from tracker import metrics, profiling, routers
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, response size and SQL queries of every request
+    into tracker.metrics.registry, labelled by URL name (`device-api-list`,
+    `check-out`...) so the series stay bounded whatever the paths. Requests
+    no URL pattern matched are counted under `unmatched`.
+
+    Streaming responses are recorded once their body has been sent.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = metrics.metrics_enabled()
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        queries, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_queries.reset(token)
+        return self.finish(request, response, queries, started)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        queries, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_queries.reset(token)
+        return self.finish(request, response, queries, started)
+
+    def start(self):
+        queries = metrics.QueryStats()
+        return queries, metrics.current_queries.set(queries), time.perf_counter()
+
+    def finish(self, request, response, queries, started):
+        match = request.resolver_match
+        route = match.view_name if match is not None and match.view_name else metrics.UNMATCHED_ROUTE
+
+        def observe(size):
+            metrics.registry.observe(
+                route, request.method, response.status_code, time.perf_counter() - started,
+                response_bytes=size, queries=queries.count, query_duration=queries.duration,
+            )
+
+        if not response.streaming:
+            observe(len(response.content))
+        elif response.is_async:
+            response.streaming_content = self.acount(response.streaming_content, queries, observe)
+        else:
+            response.streaming_content = self.count(response.streaming_content, queries, observe)
+        return response
+
+    # Streaming bodies run their queries while being sent: count those too.
+    @staticmethod
+    def count(content, queries, observe):
+        size = 0
+        iterator = iter(content)
+        try:
+            while True:
+                token = metrics.current_queries.set(queries)
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    metrics.current_queries.reset(token)
+                size += len(chunk)
+                yield chunk
+        finally:
+            observe(size)
+
+    @staticmethod
+    async def acount(content, queries, observe):
+        size = 0
+        iterator = aiter(content)
+        try:
+            while True:
+                token = metrics.current_queries.set(queries)
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    metrics.current_queries.reset(token)
+                size += len(chunk)
+                yield chunk
+        finally:
+            observe(size)
+
+
+class SlowQueryMiddleware:
+    """
+    Profiles the SQL of a request (see tracker.profiling) when
+    TRACKER_SLOW_QUERIES['ENABLED'] is set or the request carries a valid
+    X-Tracker-Profile header. Otherwise it only checks for the header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not profiling.profiling_requested(request):
+            return self.get_response(request)
+        token = profiling.current_recorder.set(profiling.SlowQueryRecorder(request))
+        try:
+            return self.get_response(request)
+        finally:
+            profiling.current_recorder.reset(token)
+
+    async def __acall__(self, request):
+        if not profiling.profiling_requested(request):
+            return await self.get_response(request)
+        token = profiling.current_recorder.set(profiling.SlowQueryRecorder(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            profiling.current_recorder.reset(token)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets tracker.routers.ReplicaRouter serve the reads of safe requests to
+    the list endpoints (TRACKER_REPLICA['ROUTES'], by URL name) from the
+    replica. Every other request, and a request once it writes, stays on
+    the primary. Does nothing unless TRACKER_REPLICA is enabled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.alias = routers.replica_alias()
+        self.routes = routers.replica_routes()
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.alias is None or request.method not in SAFE_METHODS:
+            return self.get_response(request)
+        token = routers.current_routing.set(routers.RoutingState())
+        try:
+            return self.get_response(request)
+        finally:
+            routers.current_routing.reset(token)
+
+    async def __acall__(self, request):
+        if self.alias is None or request.method not in SAFE_METHODS:
+            return await self.get_response(request)
+        token = routers.current_routing.set(routers.RoutingState())
+        try:
+            return await self.get_response(request)
+        finally:
+            routers.current_routing.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = routers.current_routing.get()
+        if state is not None and request.resolver_match.view_name in self.routes:
+            state.alias = self.alias
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_open_loans(apps, schema_editor):
+    # Before returned_at existed, a loan was open only if it was the latest log of an unavailable device.
+    Device = apps.get_model('tracker', 'Device')
+    DeviceLog = apps.get_model('tracker', 'DeviceLog')
+    open_logs = {}
+    for device_id in Device.objects.filter(is_available=False).values_list('pk', flat=True).iterator():
+        log_id = DeviceLog.objects.filter(device_id=device_id).order_by('-created_at', '-id').values_list('pk', flat=True).first()
+        if log_id is not None:
+            open_logs[device_id] = log_id
+    DeviceLog.objects.exclude(pk__in=open_logs.values()).update(returned_at=F('updated_at'))
+    for device_id, log_id in open_logs.items():
+        Device.objects.filter(pk=device_id).update(current_log_id=log_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_alter_devicelog_checked_out_condition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='current_log',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tracker.devicelog'),
+        ),
+        migrations.AddField(
+            model_name='devicelog',
+            name='returned_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_open_loans, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(condition=models.Q(('current_log__isnull', False)), fields=['owner'], name='device_checked_out_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='devicelog',
+            constraint=models.UniqueConstraint(condition=models.Q(('returned_at__isnull', True)), fields=('device',), name='devicelog_one_open_loan'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_device_current_loan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceUsageDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('returns', models.PositiveIntegerField(default=0)),
+                ('checked_out_seconds', models.PositiveBigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tracker.company')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='tracker.device')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'day'], name='device_usage_company_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('device', 'day'), name='device_usage_daily_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeUsageDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('returns', models.PositiveIntegerField(default=0)),
+                ('checked_out_seconds', models.PositiveBigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tracker.company')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='tracker.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'day'], name='employee_usage_company_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'day'), name='employee_usage_daily_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    Company = apps.get_model('tracker', 'Company')
+    CompanyVersion = apps.get_model('tracker', 'CompanyVersion')
+    CompanyVersion.objects.bulk_create(
+        [CompanyVersion(company_id=pk) for pk in Company.objects.values_list('pk', flat=True).iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_usage_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyVersion',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to='tracker.company')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
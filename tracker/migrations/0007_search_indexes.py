@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# Trigram FTS5 indexes over the searchable columns, kept in sync by triggers so
+# bulk_create / update() / raw writes are covered too. Each row also carries
+# its company as a "~<id>~" tag, so tenant scoping is part of the index match
+# instead of a lookup per matching row.
+INDEXES = (
+    ('tracker_device', 'tracker_device_fts', ('name', 'serial_no'), 'owner_id'),
+    ('tracker_employee', 'tracker_employee_fts', ('name', 'email'), 'company_id'),
+)
+
+
+def _statements(table, fts, columns, company):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    assignments = ', '.join(f'{column} = new.{column}' for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, tenant, tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}, tenant) VALUES (new.id, {new}, '~' || new.{company} || '~'); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {fts} WHERE rowid = old.id; END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names}, {company} ON {table} BEGIN "
+        f"UPDATE {fts} SET {assignments}, tenant = '~' || new.{company} || '~' WHERE rowid = old.id; END",
+        f"INSERT INTO {fts}(rowid, {names}, tenant) SELECT id, {names}, '~' || {company} || '~' FROM {table}",
+    ]
+
+
+def create_indexes(apps, schema_editor):
+    # Other backends fall back to a plain scan (see tracker.search).
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for index in INDEXES:
+        for statement in _statements(*index):
+            schema_editor.execute(statement)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for _, fts, _, _ in INDEXES:
+        for suffix in ('_ai', '_ad', '_au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_revoked_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
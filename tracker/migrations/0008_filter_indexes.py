@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['owner', 'is_available', 'created_at'], name='device_owner_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['owner', 'name'], name='device_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['owner', 'serial_no'], name='device_owner_serial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(fields=['device', 'created_at'], name='devicelog_device_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(fields=['checked_out_by', 'created_at'], name='devicelog_employee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['company', 'name'], name='employee_company_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['company', 'email'], name='employee_company_email_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDeviceLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('checked_out_condition', models.CharField(blank=True, max_length=255, null=True)),
+                ('checked_in_condition', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('returned_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(condition=models.Q(('returned_at__isnull', False)), fields=['returned_at'], name='devicelog_returned_idx'),
+        ),
+        migrations.AddField(
+            model_name='archiveddevicelog',
+            name='checked_out_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_logs', to='tracker.employee'),
+        ),
+        migrations.AddField(
+            model_name='archiveddevicelog',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_logs', to='tracker.company'),
+        ),
+        migrations.AddField(
+            model_name='archiveddevicelog',
+            name='device',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_logs', to='tracker.device'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['company', 'created_at'], name='archivedlog_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['device', 'created_at'], name='archivedlog_device_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['checked_out_by', 'created_at'], name='archivedlog_employee_idx'),
+        ),
+    ]
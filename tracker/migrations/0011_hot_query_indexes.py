@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_log_companies(apps, schema_editor):
+    Device = apps.get_model('tracker', 'Device')
+    DeviceLog = apps.get_model('tracker', 'DeviceLog')
+    DeviceLog.objects.update(company_id=Subquery(Device.objects.filter(pk=OuterRef('device_id')).values('owner_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_webhook_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicelog',
+            name='company',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='device_logs', to='tracker.company'),
+        ),
+        migrations.RunPython(backfill_log_companies, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='devicelog',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_logs', to='tracker.company'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['created_at'], name='company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['company', 'created_at'], name='employee_company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['owner', 'created_at'], name='device_owner_created_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='device',
+            name='device_checked_out_idx',
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(condition=models.Q(('current_log__isnull', False)), fields=['owner', 'created_at'], name='device_checked_out_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(fields=['company', 'created_at'], name='devicelog_company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(condition=models.Q(('returned_at__isnull', True)), fields=['company', 'created_at'], name='devicelog_company_open_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='devicelog',
+            name='devicelog_device_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='devicelog',
+            name='devicelog_employee_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(fields=['company', 'device', 'created_at'], name='devicelog_device_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devicelog',
+            index=models.Index(fields=['company', 'checked_out_by', 'created_at'], name='devicelog_employee_created_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='archiveddevicelog',
+            name='archivedlog_company_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archiveddevicelog',
+            name='archivedlog_device_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archiveddevicelog',
+            name='archivedlog_employee_idx',
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['company', 'created_at', 'id'], name='archivedlog_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['company', 'device', 'created_at', 'id'], name='archivedlog_device_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddevicelog',
+            index=models.Index(fields=['company', 'checked_out_by', 'created_at', 'id'], name='archivedlog_employee_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='deviceusagedaily',
+            name='device_usage_company_day_idx',
+        ),
+        migrations.AddIndex(
+            model_name='deviceusagedaily',
+            index=models.Index(fields=['company', 'device', 'day', 'loans', 'returns', 'checked_out_seconds'], name='device_usage_report_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='employeeusagedaily',
+            name='employee_usage_company_day_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employeeusagedaily',
+            index=models.Index(fields=['company', 'employee', 'day', 'loans', 'returns', 'checked_out_seconds'], name='employee_usage_report_idx'),
+        ),
+    ]
@@ -0,0 +1,159 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from tracker import rendering, versioning
+from tracker.fieldsets import only_fields, parse_fieldset
+from tracker.tenancy import get_request_company
+
+
+class QueryPlanMixin:
+    """
+    Let a view declare the related rows its serializer renders, e.g.
+
+        select_related_fields = ('owner__owner',)
+        prefetch_related_fields = ('logs',)
+
+    The plan is applied in `filter_queryset`, which DRF runs for both list
+    and detail (`get_object`) requests, so nested serializers never fall
+    back to one query per row.
+
+    Reads honour `?fields=` / `?expand=` (see tracker.fieldsets): only the
+    selected columns are loaded and only expanded relations are joined.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        return parse_fieldset(self.request.query_params)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
+
+    def get_select_related_fields(self):
+        fieldset = self.get_fieldset()
+        return self.select_related_fields if fieldset is None else fieldset.select_related(self.select_related_fields)
+
+    def get_prefetch_related_fields(self):
+        fieldset = self.get_fieldset()
+        return self.prefetch_related_fields if fieldset is None else fieldset.select_related(self.prefetch_related_fields)
+
+    def apply_query_plan(self, queryset):
+        select_related = self.get_select_related_fields()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetch_related = self.get_prefetch_related_fields()
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if self.get_fieldset() is not None:
+            # Building the serializer also rejects unknown fields before any query runs.
+            queryset = queryset.only(*only_fields(self.get_serializer(), self.get_pagination_ordering(queryset)))
+        return queryset
+
+    def get_pagination_ordering(self, queryset):
+        paginator = self.paginator
+        if paginator is None or not hasattr(paginator, 'get_ordering'):
+            return ()
+        return paginator.get_ordering(self.request, queryset, self)
+
+    def filter_queryset(self, queryset):
+        return self.apply_query_plan(super().filter_queryset(queryset))
+
+
+class CompanyScopedMixin:
+    """
+    Views whose data belongs to the requesting user's company.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Resolve the company before the body is validated, so a token whose
+        # company is gone gets a 401 rather than errors about its rows.
+        if request.user and request.user.is_authenticated:
+            get_request_company(request)
+
+    def get_company(self):
+        company = get_request_company(self.request)
+        if company is None:
+            raise NotFound("Company not found")
+        return company
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for company-scoped reads.
+
+    Both come from the company's version counter, so a request carrying a
+    current `If-None-Match` gets a 304 after one primary key lookup, without
+    querying or serializing the company's data. With TRACKER_RESPONSE_CACHE
+    enabled, full responses are also served from the cache by the same key.
+    Requires CompanyScopedMixin.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        company = self.get_company()
+        version, updated_at = versioning.get_company_version(company.pk)
+        etag = versioning.make_etag(company.pk, version, request)
+        last_modified = int(updated_at.timestamp())
+
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = versioning.get_cached_response(etag) if versioning.response_cache_enabled() else None
+            if cached is not None:
+                response = Response(cached)
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code == 200 and versioning.response_cache_enabled():
+                    versioning.cache_response(etag, response.data)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class FastListMixin:
+    """
+    With TRACKER_FAST_LISTS enabled, JSON list responses skip the model
+    serializer: rows are read with `values()`, converted by a RowPlan
+    compiled from the serializer's fields and encoded by FastJSONRenderer.
+    The body is byte-for-byte the one the serializer renders. Requests the
+    plan cannot reproduce (fieldsets, other renderers, indentation,
+    unsupported fields) take the regular path.
+    """
+    fast_renderer = rendering.FastJSONRenderer()
+
+    def get_row_plan(self, request):
+        if not rendering.fast_lists_enabled():
+            return None
+        if type(request.accepted_renderer) is not JSONRenderer or request.accepted_media_type != JSONRenderer.media_type:
+            return None
+        if getattr(self, 'get_fieldset', None) and self.get_fieldset() is not None:
+            return None
+        return rendering.RowPlan.compile(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_row_plan(request)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        # The keyset paginator reads its cursor position from the row, so the ordering columns come along.
+        ordering = [name.lstrip('-') for name in self.get_pagination_ordering(queryset)]
+        rows = queryset.values(*dict.fromkeys(plan.lookups + ordering))
+        request.accepted_renderer = self.fast_renderer
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.to_representation(page))
+        return Response(plan.to_representation(rows))
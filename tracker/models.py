@@ -17,6 +17,12 @@ class Company(TimeStampMixin):
     name = models.CharField(max_length=255)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='company')
 
+    class Meta:
+        indexes = [
+            # Keyset pages of CompanyView, newest first
+            models.Index(fields=['created_at'], name='company_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -26,6 +32,15 @@ class Employee(TimeStampMixin):
     address = models.CharField(max_length=255)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='employees')
 
+    class Meta:
+        indexes = [
+            # Keyset pages of a company's employees, newest first
+            models.Index(fields=['company', 'created_at'], name='employee_company_created_idx'),
+            # Filters of EmployeeView (see tracker.filters.EmployeeFilter)
+            models.Index(fields=['company', 'name'], name='employee_company_name_idx'),
+            models.Index(fields=['company', 'email'], name='employee_company_email_idx'),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -34,6 +49,19 @@ class Device(TimeStampMixin):
     serial_no = models.CharField(max_length=255, unique=True)
     owner = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='devices')
     is_available = models.BooleanField(default=True)
+    current_log = models.ForeignKey('DeviceLog', null=True, blank=True, on_delete=models.SET_NULL, related_name='+') # Open loan, if any
+
+    class Meta:
+        indexes = [
+            # Keyset pages of a company's devices, newest first
+            models.Index(fields=['owner', 'created_at'], name='device_owner_created_idx'),
+            # "Who has what now" for a company only touches checked out devices.
+            models.Index(fields=['owner', 'created_at'], condition=models.Q(current_log__isnull=False), name='device_checked_out_idx'),
+            # Filters of DeviceView (see tracker.filters.DeviceFilter)
+            models.Index(fields=['owner', 'is_available', 'created_at'], name='device_owner_available_idx'),
+            models.Index(fields=['owner', 'name'], name='device_owner_name_idx'),
+            models.Index(fields=['owner', 'serial_no'], name='device_owner_serial_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -43,7 +71,134 @@ class DeviceLog(TimeStampMixin):
     checked_out_by = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='deviceHistory')
     checked_out_condition = models.CharField(max_length=255, null = True, blank=True) # Device Condition
     checked_in_condition = models.CharField(max_length=255, null=True, blank=True) # Device Condition after return
+    returned_at = models.DateTimeField(null=True, blank=True) # Empty while the loan is open
+    # The device's owner, so a company's loans can be read newest first from one index without a join.
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='device_logs')
+
+    class Meta:
+        constraints = [
+            # At most one open loan per device; doubles as the open-loan index.
+            models.UniqueConstraint(fields=['device'], condition=models.Q(returned_at__isnull=True), name='devicelog_one_open_loan'),
+        ]
+        indexes = [
+            # Keyset pages of a company's loans, newest first, and of its open loans
+            models.Index(fields=['company', 'created_at'], name='devicelog_company_created_idx'),
+            models.Index(fields=['company', 'created_at'], condition=models.Q(returned_at__isnull=True), name='devicelog_company_open_idx'),
+            # Filters of DeviceLogView (see tracker.filters.DeviceLogFilter). They lead with the
+            # company the view always filters on, so they beat devicelog_company_created_idx.
+            models.Index(fields=['company', 'device', 'created_at'], name='devicelog_device_created_idx'),
+            models.Index(fields=['company', 'checked_out_by', 'created_at'], name='devicelog_employee_created_idx'),
+            # Archival walks closed loans oldest first (see tracker.archive).
+            models.Index(fields=['returned_at'], condition=models.Q(returned_at__isnull=False), name='devicelog_returned_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.company_id is None and self.device_id is not None:
+            self.company_id = Device.objects.values_list('owner_id', flat=True).get(pk=self.device_id)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.device.name} - by:{self.checked_out_by.name}"
 
+
+# Closed loans moved out of DeviceLog by tracker.archive: same ids and values,
+# plus the company so tenant reads need no join.
+class ArchivedDeviceLog(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='archived_logs')
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='archived_logs')
+    checked_out_by = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='archived_logs')
+    checked_out_condition = models.CharField(max_length=255, null=True, blank=True)
+    checked_in_condition = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    returned_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Filters of DeviceLogView with ?archived=true (see tracker.filters.ArchivedDeviceLogFilter).
+            # `id` is not the rowid here, so it ends each key to keep the keyset order sort-free.
+            models.Index(fields=['company', 'created_at', 'id'], name='archivedlog_company_idx'),
+            models.Index(fields=['company', 'device', 'created_at', 'id'], name='archivedlog_device_idx'),
+            models.Index(fields=['company', 'checked_out_by', 'created_at', 'id'], name='archivedlog_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.device_id} - by:{self.checked_out_by_id} (archived)"
+
+
+# Usage rollups, maintained incrementally by check-out / check-in (see tracker.analytics)
+class UsageRollup(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    loans = models.PositiveIntegerField(default=0) # Loans started this day
+    returns = models.PositiveIntegerField(default=0) # Loans ended this day
+    checked_out_seconds = models.PositiveBigIntegerField(default=0) # Returned loan time falling on this day
+
+    class Meta:
+        abstract = True
+
+class DeviceUsageDaily(UsageRollup):
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='usage')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'day'], name='device_usage_daily_unique'),
+        ]
+        indexes = [
+            # Covers the utilization report: per-device sums over a window, already grouped.
+            models.Index(fields=['company', 'device', 'day', 'loans', 'returns', 'checked_out_seconds'], name='device_usage_report_idx'),
+        ]
+
+class EmployeeUsageDaily(UsageRollup):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='usage')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'day'], name='employee_usage_daily_unique'),
+        ]
+        indexes = [
+            # Covers the utilization report: per-employee sums over a window, already grouped.
+            models.Index(fields=['company', 'employee', 'day', 'loans', 'returns', 'checked_out_seconds'], name='employee_usage_report_idx'),
+        ]
+
+
+# Per-company change counter behind the ETags of list / detail responses (see tracker.versioning)
+class CompanyVersion(models.Model):
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0) # Bumped on every change to the company's data
+    updated_at = models.DateTimeField(auto_now_add=True) # Time of the last bump
+
+
+# Revoked refresh tokens, kept only until the token would have expired (see tracker.revocation)
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+# Transactional outbox: device events written with the change itself, delivered to webhooks later (see tracker.outbox)
+class OutboxEvent(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+')
+    type = models.CharField(max_length=64) # e.g. device.checked_out
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.type} #{self.pk}"
+
+
+# Delivery position of one webhook endpoint: every event up to last_event_id was accepted
+class WebhookCursor(models.Model):
+    url = models.CharField(max_length=500, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0) # Failed attempts at the current batch
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
@@ -0,0 +1,260 @@
+import hashlib
+import hmac
+import http.client
+import itertools
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.utils import timezone
+
+from tracker.models import OutboxEvent, WebhookCursor
+
+logger = logging.getLogger(__name__)
+
+CHECKED_OUT = 'device.checked_out'
+CHECKED_IN = 'device.checked_in'
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_TIMEOUT = 5
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 300.0
+DEFAULT_COMMIT_GRACE = 5.0
+SIGNATURE_HEADER = 'X-Tracker-Signature'
+
+
+def webhook_options():
+    return getattr(settings, 'TRACKER_WEBHOOKS', {})
+
+
+def webhook_endpoints():
+    return webhook_options().get('ENDPOINTS', [])
+
+
+# Recording: called inside the transaction that changes the loans
+def _isoformat(value):
+    return timezone.localtime(value).isoformat() if value is not None else None
+
+
+def record_events(company_id, event_type, payloads):
+    """
+    Add events to the outbox with one INSERT. Call it inside the
+    transaction of the change, so an event exists exactly when its change
+    was committed. Nothing is recorded while no endpoint is configured.
+    """
+    if not payloads or not webhook_endpoints():
+        return
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(company_id=company_id, type=event_type, payload=payload) for payload in payloads
+    ])
+
+
+def record_check_outs(company_id, logs):
+    record_events(company_id, CHECKED_OUT, [{
+        'device': log.device_id,
+        'log': log.pk,
+        'employee': log.checked_out_by_id,
+        'condition': log.checked_out_condition,
+        'at': _isoformat(log.created_at),
+    } for log in logs])
+
+
+def record_check_ins(company_id, logs):
+    """
+    `logs` must have `returned_at` set.
+    """
+    record_events(company_id, CHECKED_IN, [{
+        'device': log.device_id,
+        'log': log.pk,
+        'employee': log.checked_out_by_id,
+        'condition': log.checked_in_condition,
+        'at': _isoformat(log.returned_at),
+    } for log in logs])
+
+
+# Delivery
+class HTTPClient:
+    """
+    Minimal pooled HTTP client: one keep-alive connection per origin,
+    reused across batches and reopened after an error.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.connections = {}
+
+    def _connection(self, scheme, netloc):
+        key = (scheme, netloc)
+        if key not in self.connections:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            self.connections[key] = connection_class(netloc, timeout=self.timeout)
+        return key, self.connections[key]
+
+    def post(self, url, body, headers):
+        """
+        POST `body` (bytes) and return the response status.
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        for attempt in range(2):
+            key, connection = self._connection(parts.scheme, parts.netloc)
+            reused = connection.sock is not None
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                del self.connections[key]
+                # A kept-alive connection the server has since closed fails once; retry on a new one.
+                if attempt or not reused:
+                    raise
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+
+def event_body(event):
+    return {
+        'id': event.pk,
+        'type': event.type,
+        'company': event.company_id,
+        'created_at': _isoformat(event.created_at),
+        'data': event.payload,
+    }
+
+
+class Dispatcher:
+    """
+    Delivers outbox events to every endpoint in TRACKER_WEBHOOKS['ENDPOINTS'].
+
+    Each endpoint has a WebhookCursor and receives the events after it, in
+    id order, as `{"events": [...]}` batches. A batch is retried (with
+    exponential backoff) until the endpoint answers 2xx, and the next batch
+    is only sent after that, so every endpoint sees events in order and a
+    failing endpoint holds back no other. Delivery is at least once:
+    receivers should ignore event ids they have already processed.
+
+    Ids are not assigned in commit order (on Postgres a transaction holding
+    a lower id can commit after a higher one), so a cursor moving past a
+    visible event could skip one still in flight. Events younger than
+    `commit_grace` seconds (TRACKER_WEBHOOKS['COMMIT_GRACE']) are therefore
+    not sent yet, and a batch stops at the first of them; the grace must
+    exceed the longest transaction that records events.
+    """
+
+    def __init__(self, endpoints=None, client=None, batch_size=None, backoff=None, max_backoff=None, commit_grace=None):
+        options = webhook_options()
+        self.endpoints = endpoints if endpoints is not None else webhook_endpoints()
+        self.client = client or HTTPClient(options.get('TIMEOUT', DEFAULT_TIMEOUT))
+        self.batch_size = batch_size or options.get('BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.backoff = backoff if backoff is not None else options.get('BACKOFF', DEFAULT_BACKOFF)
+        self.max_backoff = max_backoff if max_backoff is not None else options.get('MAX_BACKOFF', DEFAULT_MAX_BACKOFF)
+        self.commit_grace = commit_grace if commit_grace is not None else options.get('COMMIT_GRACE', DEFAULT_COMMIT_GRACE)
+        self.delivered = 0
+        self.batches = 0
+        self.failures = 0
+
+    def cursors(self):
+        cursors = {cursor.url: cursor for cursor in WebhookCursor.objects.filter(url__in=[e['URL'] for e in self.endpoints])}
+        for endpoint in self.endpoints:
+            if endpoint['URL'] not in cursors:
+                cursors[endpoint['URL']], _ = WebhookCursor.objects.get_or_create(url=endpoint['URL'])
+        return cursors
+
+    def run_once(self):
+        """
+        Send at most one batch to each endpoint that is due; returns the
+        number of events delivered.
+        """
+        delivered = 0
+        cursors = self.cursors()
+        now = timezone.now()
+        for endpoint in self.endpoints:
+            cursor = cursors[endpoint['URL']]
+            if cursor.next_attempt_at is None or cursor.next_attempt_at <= now:
+                delivered += self.deliver(endpoint, cursor)
+        self.prune(cursors)
+        return delivered
+
+    def deliver(self, endpoint, cursor):
+        settled = timezone.now() - timezone.timedelta(seconds=self.commit_grace)
+        events = list(itertools.takewhile(
+            lambda event: event.created_at <= settled,
+            OutboxEvent.objects.filter(pk__gt=cursor.last_event_id).order_by('pk')[:self.batch_size],
+        ))
+        if not events:
+            return 0
+        body = json.dumps({'events': [event_body(event) for event in events]}, separators=(',', ':')).encode()
+        headers = {'Content-Type': 'application/json'}
+        if endpoint.get('SECRET'):
+            digest = hmac.new(endpoint['SECRET'].encode(), body, hashlib.sha256).hexdigest()
+            headers[SIGNATURE_HEADER] = f'sha256={digest}'
+        try:
+            status = self.client.post(endpoint['URL'], body, headers)
+            error = None if 200 <= status < 300 else f"HTTP {status}"
+        except (OSError, http.client.HTTPException) as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is None:
+            cursor.last_event_id = events[-1].pk
+            cursor.attempts = 0
+            cursor.next_attempt_at = None
+            cursor.last_error = ''
+            self.delivered += len(events)
+            self.batches += 1
+        else:
+            cursor.attempts += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (cursor.attempts - 1))
+            cursor.next_attempt_at = timezone.now() + timezone.timedelta(seconds=delay)
+            cursor.last_error = error
+            self.failures += 1
+            logger.warning("Webhook delivery to %s failed (attempt %d): %s", endpoint['URL'], cursor.attempts, error)
+        cursor.save()
+        return len(events) if error is None else 0
+
+    def prune(self, cursors):
+        """
+        Drop events every configured endpoint has accepted.
+        """
+        if cursors:
+            OutboxEvent.objects.filter(pk__lte=min(cursor.last_event_id for cursor in cursors.values())).delete()
+
+    def lag(self):
+        """
+        Seconds since the oldest event each endpoint has not received yet (0 when caught up).
+        """
+        lags = {}
+        now = timezone.now()
+        for url, cursor in self.cursors().items():
+            oldest = OutboxEvent.objects.filter(pk__gt=cursor.last_event_id).order_by('pk').values_list('created_at', flat=True).first()
+            lags[url] = (now - oldest).total_seconds() if oldest else 0.0
+        return lags
+
+    def stats(self):
+        return {'delivered': self.delivered, 'batches': self.batches, 'failures': self.failures, 'lag': self.lag()}
+
+    def run(self, poll_interval=1.0, stop=None, drain=False):
+        """
+        Deliver until `stop` (a threading.Event) is set, sleeping
+        `poll_interval` whenever a pass sent nothing. With `drain`, return
+        after the first such pass instead.
+        """
+        try:
+            while stop is None or not stop.is_set():
+                if self.run_once():
+                    continue
+                if drain:
+                    return
+                if stop is not None:
+                    stop.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            self.client.close()
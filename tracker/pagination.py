@@ -0,0 +1,176 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the full ordering, e.g. (created_at, id).
+
+    DRF's CursorPagination only stores the first ordering field in the cursor
+    and falls back to an OFFSET for rows sharing that value. Here the cursor
+    holds every ordering value, the last one being the primary key, so a
+    position is always unique: each page is a single index range scan
+    starting right after the previous page, however deep into history it is,
+    and rows inserted meanwhile never shift the pages that follow.
+
+    The cursor also records the ordering it was taken under: a `next` link
+    followed with another `?ordering=` is rejected instead of being
+    compared against the wrong columns.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        # Always end on the primary key so the position is unique.
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            direction = '-' if ordering[0].startswith('-') else ''
+            ordering = ordering + (f'{direction}id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self._set_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        `paginate_queryset` for async views: the page is read with the async ORM.
+        """
+        queryset = self._page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self._set_page([row async for row in queryset[:self.page_size + 1]])
+
+    def _page_queryset(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+
+        if reverse:
+            queryset = queryset.order_by(*[self._flip(order) for order in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._after(self._load_position(current_position, queryset.model), reverse))
+        return queryset
+
+    def _set_page(self, results):
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _after(self, position, reverse):
+        """
+        Rows strictly after `position` in the (possibly reversed) ordering:
+        (a, b) > (x, y) becomes a >= x AND (a > x OR (a = x AND b > y)).
+        The leading bound keeps the lookup a range scan on the ordering index.
+        """
+        lookups = []
+        for order in self.ordering:
+            descending = order.startswith('-') != reverse
+            lookups.append((order.lstrip('-'), 'lt' if descending else 'gt'))
+
+        condition = Q()
+        for i in range(len(lookups) - 1, -1, -1):
+            field, lookup = lookups[i]
+            step = Q(**{f'{field}__{lookup}': position[i]})
+            if i < len(lookups) - 1:
+                step |= Q(**{field: position[i]}) & condition
+            condition = step
+        first_field, first_lookup = lookups[0]
+        return Q(**{f'{first_field}__{first_lookup}e': position[0]}) & condition
+
+    def _flip(self, order):
+        return order[1:] if order.startswith('-') else f'-{order}'
+
+    def _load_position(self, position, model):
+        """
+        The cursor's values as Python values of the ordering fields; any
+        cursor not produced under the current ordering is a 404.
+        """
+        try:
+            cursor = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(cursor, dict) or cursor.get('ordering') != list(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = cursor.get('values')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        # Ordering columns are never null, and a cursor only ever holds scalars.
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [self._ordering_field(model, order).to_python(value) for order, value in zip(self.ordering, values)]
+        except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _ordering_field(self, model, order):
+        name = order.lstrip('-')
+        return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return json.dumps({'ordering': list(ordering), 'values': values}, separators=(',', ':'))
+
+
+class SearchPagination(LimitOffsetPagination):
+    """
+    Search results are ordered by rank, which has no stable keyset; clients
+    page through the best matches with `limit` / `offset` instead.
+    """
+    default_limit = 20
+    max_limit = 100
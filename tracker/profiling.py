@@ -0,0 +1,179 @@
+import contextvars
+import json
+import logging
+import os
+import re
+import time
+import traceback
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+
+logger = logging.getLogger('tracker.slow_queries')
+
+PROFILE_HEADER = 'X-Tracker-Profile'
+PROFILE_SALT = 'tracker.profiling'
+DEFAULT_THRESHOLD_MS = 100
+DEFAULT_HEADER_MAX_AGE = 3600
+STACK_DEPTH = 8
+MAX_PARAM_LENGTH = 200
+EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+# SQLite: "SCAN device" / "SCAN TABLE device" without an index; Postgres: "Seq Scan on device".
+FULL_SCAN = re.compile(r'^\s*(?:SCAN(?: TABLE)? (\w+)(?!.*\bUSING\b)|.*Seq Scan on (\w+))')
+NOT_A_TABLE_SCAN = ('SCAN CONSTANT ROW', 'VIRTUAL TABLE')
+
+
+def profiling_options():
+    return getattr(settings, 'TRACKER_SLOW_QUERIES', {})
+
+
+def make_profile_token():
+    """
+    A value for the X-Tracker-Profile header that turns profiling on for
+    the requests carrying it, until it is HEADER_MAX_AGE seconds old.
+    """
+    return signing.TimestampSigner(salt=PROFILE_SALT).sign('profile')
+
+
+def valid_profile_token(value, max_age=None):
+    if max_age is None:
+        max_age = profiling_options().get('HEADER_MAX_AGE', DEFAULT_HEADER_MAX_AGE)
+    try:
+        return signing.TimestampSigner(salt=PROFILE_SALT).unsign(value, max_age=max_age) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def profiling_requested(request):
+    """
+    Profile this request? Always when TRACKER_SLOW_QUERIES['ENABLED'] is
+    set, otherwise only with a valid signed profile header.
+    """
+    if profiling_options().get('ENABLED', False):
+        return True
+    value = request.headers.get(PROFILE_HEADER)
+    return value is not None and valid_profile_token(value)
+
+
+# Analysis of one statement
+def full_scans(plan):
+    """
+    Tables the plan reads without an index.
+    """
+    tables = []
+    for line in plan:
+        if any(marker in line for marker in NOT_A_TABLE_SCAN):
+            continue
+        match = FULL_SCAN.match(line)
+        if match:
+            tables.append(match.group(1) or match.group(2))
+    return tables
+
+
+def explain(connection, sql, params):
+    """
+    The plan lines of `sql` (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on
+    Postgres), or None for statements that cannot be explained.
+    """
+    if not sql.lstrip().lower().startswith(EXPLAINABLE):
+        return None
+    # A savepoint, so a failing EXPLAIN does not abort the request's transaction on Postgres.
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def stack_summary():
+    """
+    The innermost project frames ("tracker/views.py:42 in get_queryset"),
+    skipping Django, DRF and this module.
+    """
+    base = str(settings.BASE_DIR) + os.sep
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(base) and 'site-packages' not in frame.filename and frame.filename != __file__
+    ]
+    return [f'{os.path.relpath(frame.filename, base)}:{frame.lineno} in {frame.name}' for frame in frames[-STACK_DEPTH:]]
+
+
+def _param(value):
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    value = str(value)
+    return value if len(value) <= MAX_PARAM_LENGTH else value[:MAX_PARAM_LENGTH] + '...'
+
+
+# Per-request recorder
+class SlowQueryRecorder:
+    """
+    Logs every statement of one request that takes longer than
+    `threshold_ms`, with its parameters, the project frames that ran it and
+    its query plan, as one JSON line on the `tracker.slow_queries` logger.
+
+    Parameters are logged as sent, so only profile where that is acceptable.
+    """
+
+    def __init__(self, request, threshold_ms=None):
+        self.request = request
+        if threshold_ms is None:
+            threshold_ms = profiling_options().get('THRESHOLD_MS', DEFAULT_THRESHOLD_MS)
+        self.threshold = threshold_ms / 1000
+        self.statements = 0
+        self.slow = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        self.statements += 1
+        if duration >= self.threshold:
+            self.record(context['connection'], sql, params, many, duration)
+        return result
+
+    def record(self, connection, sql, params, many, duration):
+        self.slow += 1
+        sample = params[0] if many and params else params
+        token = current_recorder.set(None)  # the EXPLAIN itself is not profiled
+        try:
+            plan, error = explain(connection, sql, sample), None
+        except Exception as e:
+            plan, error = None, f'{type(e).__name__}: {e}'
+        finally:
+            current_recorder.reset(token)
+        match = self.request.resolver_match
+        entry = {
+            'route': match.view_name if match is not None else None,
+            'method': self.request.method,
+            'path': self.request.get_full_path(),
+            'database': connection.alias,
+            'duration_ms': round(duration * 1000, 3),
+            'sql': sql,
+            'params': [_param(value) for value in sample] if isinstance(sample, (list, tuple)) else _param(sample),
+            'many': many,
+            'stack': stack_summary(),
+            'plan': plan,
+            'full_scans': full_scans(plan or []),
+        }
+        if error:
+            entry['explain_error'] = error
+        logger.warning(json.dumps(entry, default=str))
+
+
+current_recorder = contextvars.ContextVar('tracker_slow_query_recorder', default=None)
+
+
+def profile_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_profiler(sender, connection, **kwargs):
+    """
+    connection_created receiver. Costs one context variable lookup per
+    query while no request is being profiled.
+    """
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_query)
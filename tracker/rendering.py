@@ -0,0 +1,131 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import ISO_8601, api_settings
+
+try:
+    import orjson
+except ImportError:  # optional; FastJSONRenderer then renders like JSONRenderer
+    orjson = None
+
+# Fields whose to_representation returns database values unchanged.
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField)
+PASSTHROUGH_METHODS = {field.to_representation for field in PASSTHROUGH_FIELDS}
+
+
+def fast_lists_enabled():
+    return getattr(settings, 'TRACKER_FAST_LISTS', {}).get('ENABLED', False)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer output, encoded with orjson when it is installed.
+
+    Only for data made of dicts, lists, str, int, bool and None, such as
+    RowPlan output: orjson writes some floats differently from `json`.
+    Anything orjson refuses, or an indented response, goes through
+    JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: keep the output a strict JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+def _datetime_converter(tz):
+    # DateTimeField.to_representation for ISO 8601 output, with the timezone resolved once.
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _converter(field):
+    """
+    (supported, converter) for a leaf field; a None converter passes the value through.
+    """
+    to_representation = type(field).to_representation
+    if isinstance(field, PrimaryKeyRelatedField):
+        return field.pk_field is None, None
+    if isinstance(field, PASSTHROUGH_FIELDS) and to_representation in PASSTHROUGH_METHODS:
+        return True, None
+    if isinstance(field, serializers.BigIntegerField) and to_representation is serializers.BigIntegerField.to_representation:
+        return True, str if getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING) else None
+    if isinstance(field, serializers.DateTimeField) and to_representation is serializers.DateTimeField.to_representation:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601 and tz is not None:
+            return True, _datetime_converter(tz)
+    return False, None
+
+
+class RowPlan:
+    """
+    A serializer's output compiled against `values()` rows.
+
+    Each readable field becomes (key, lookup, converter, nested plan), so a
+    list is rendered with one dict lookup and at most one call per value
+    instead of DRF's per-field attribute resolution. Nested model
+    serializers read their columns through joins in the same query.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    @classmethod
+    def compile(cls, serializer, prefix=''):
+        """
+        The plan for a bound serializer, or None if any field cannot be
+        reproduced exactly (method fields, dotted sources, many relations...).
+        """
+        entries = []
+        for field in serializer._readable_fields:
+            if field.source == '*' or '.' in field.source:
+                return None
+            lookup = prefix + field.source
+            if isinstance(field, serializers.ModelSerializer):
+                nested = cls.compile(field, f'{lookup}__')
+                if nested is None:
+                    return None
+                entries.append((field.field_name, lookup, None, nested))
+                continue
+            supported, converter = _converter(field)
+            if not supported:
+                return None
+            entries.append((field.field_name, lookup, converter, None))
+        return cls(entries)
+
+    @property
+    def lookups(self):
+        lookups = []
+        for _, lookup, _, nested in self.entries:
+            lookups.append(lookup)
+            if nested is not None:
+                lookups.extend(nested.lookups)
+        return lookups
+
+    def to_dict(self, row):
+        data = {}
+        for key, lookup, converter, nested in self.entries:
+            value = row[lookup]
+            if value is None:
+                data[key] = None
+            elif nested is not None:
+                data[key] = nested.to_dict(row)
+            elif converter is None:
+                data[key] = value
+            else:
+                data[key] = converter(value)
+        return data
+
+    def to_representation(self, rows):
+        return [self.to_dict(row) for row in rows]
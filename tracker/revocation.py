@@ -0,0 +1,128 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from tracker.models import RevokedToken
+
+DEFAULT_ERROR_RATE = 0.01
+DEFAULT_REBUILD_INTERVAL = 3600
+MIN_CAPACITY = 10000
+LOAD_CHUNK_SIZE = 10000
+
+
+class BloomFilter:
+    """
+    Fixed-size set of strings with no false negatives and roughly
+    `error_rate` false positives once `capacity` items have been added.
+    About 1.2 MB per million items at 1%.
+    """
+
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def prune_expired(now=None):
+    """
+    Delete revocations of tokens that have expired anyway, in one statement.
+    """
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
+
+
+class RevocationStore:
+    """
+    Answers "is this refresh token revoked?" from memory.
+
+    RevokedToken is the authoritative record; a Bloom filter of its jtis
+    lets the common case (a token that was never revoked) skip the
+    database. A filter hit is confirmed with a primary key lookup, since it
+    may be a false positive. Revoking inserts into the unique jti column, so
+    two processes cannot both rotate the same token even though each only
+    sees its own additions to its filter until the next rebuild.
+
+    The filter is rebuilt from the table every `rebuild_interval` seconds or
+    once it outgrows its capacity; expired revocations are pruned first, so
+    they drop out of memory too.
+    """
+
+    def __init__(self, error_rate=DEFAULT_ERROR_RATE, rebuild_interval=DEFAULT_REBUILD_INTERVAL):
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._filter = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self):
+        bloom = self._filter
+        if bloom is None or bloom.count > bloom.capacity or time.monotonic() - self._built_at > self.rebuild_interval:
+            bloom = self.rebuild()
+        return bloom
+
+    def rebuild(self):
+        with self._lock:
+            prune_expired()
+            # Room for twice the current revocations before the next rebuild.
+            bloom = BloomFilter(max(2 * RevokedToken.objects.count(), MIN_CAPACITY), self.error_rate)
+            for jti in RevokedToken.objects.values_list('jti', flat=True).iterator(chunk_size=LOAD_CHUNK_SIZE):
+                bloom.add(jti)
+            self._filter, self._built_at = bloom, time.monotonic()
+            return bloom
+
+    def is_revoked(self, jti):
+        if jti not in self._current():
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke a token; returns False if it already was.
+        """
+        bloom = self._current()
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+            revoked = True
+        except IntegrityError:
+            revoked = False
+        with self._lock:
+            bloom.add(jti)
+        return revoked
+
+    def clear(self):
+        with self._lock:
+            self._filter, self._built_at = None, 0.0
+
+
+def _build_store():
+    options = getattr(settings, 'TRACKER_REVOCATION', {})
+    return RevocationStore(
+        error_rate=options.get('ERROR_RATE', DEFAULT_ERROR_RATE),
+        rebuild_interval=options.get('REBUILD_INTERVAL', DEFAULT_REBUILD_INTERVAL),
+    )
+
+
+revocation_store = _build_store()
@@ -0,0 +1,66 @@
+import contextvars
+
+from django.conf import settings
+
+def replica_options():
+    return getattr(settings, 'TRACKER_REPLICA', {})
+
+
+def replica_alias():
+    """
+    The replica's DATABASES alias, or None when reads are not routed.
+    """
+    options = replica_options()
+    alias = options.get('ALIAS', 'replica')
+    if not options.get('ENABLED', False) or alias not in settings.DATABASES:
+        return None
+    return alias
+
+
+def replica_routes():
+    """
+    URL names whose GETs may be served by the replica (TRACKER_REPLICA['ROUTES']); none by default.
+    """
+    return frozenset(replica_options().get('ROUTES', ()))
+
+
+class RoutingState:
+    """
+    Where the current request reads. Set up by ReplicaRoutingMiddleware;
+    the first write of the request pins it to the primary.
+    """
+
+    __slots__ = ('alias',)
+
+    def __init__(self):
+        self.alias = None
+
+
+current_routing = contextvars.ContextVar('tracker_routing', default=None)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of replica-routed requests to the replica alias and
+    everything else (writes, reads for update such as get_or_create or
+    select_for_update, other requests, background jobs) to the primary, by
+    returning None.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        return state.alias if state is not None else None
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.alias = None
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the primary's rows, so objects read from it may
+        # be related to (and saved with) objects of the primary.
+        aliases = {'default', replica_options().get('ALIAS', 'replica')}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
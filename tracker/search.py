@@ -0,0 +1,120 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from tracker.models import Device, Employee
+
+MIN_TERM_LENGTH = 3 # Shortest term the trigram index can match
+MAX_MATCHES = 1000 # Matches ranked per query (newest first); refine the query beyond that
+
+
+class SearchIndex:
+    """
+    Ranked substring search over some columns of a company's rows.
+
+    On SQLite this reads the trigram FTS5 table created by migration 0007
+    (best bm25 rank first); elsewhere it falls back to `icontains`, which is
+    also what `scan` runs for comparison.
+
+    bm25 costs tens of microseconds per matching row, so only the newest
+    MAX_MATCHES matches are counted and ranked: a term found in every row
+    of a large tenant stays as cheap as a selective one.
+    """
+
+    def __init__(self, model, table, columns, company_field):
+        self.model = model
+        self.table = table
+        self.columns = columns
+        self.company_field = company_field
+
+    @property
+    def connection(self):
+        # The database the ORM reads these rows from (tracker.routers), so matches and rows agree.
+        return connections[router.db_for_read(self.model)]
+
+    @property
+    def indexed(self):
+        return self.connection.vendor == 'sqlite'
+
+    def match_expression(self, company, terms):
+        # Every term must occur in a searchable column, quoted so user input is
+        # never FTS syntax; the tenant tag restricts matches to one company.
+        phrases = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        return f'{{{" ".join(self.columns)}}} : ({phrases}) AND tenant : "~{company.pk}~"'
+
+    def count(self, company, terms):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM (SELECT 1 FROM {self.table} WHERE {self.table} MATCH %s LIMIT %s)",
+                [self.match_expression(company, terms), MAX_MATCHES],
+            )
+            return cursor.fetchone()[0]
+
+    def ids(self, company, terms, offset, limit):
+        weights = ', '.join(['1.0'] * len(self.columns) + ['0.0'])
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM (SELECT rowid, bm25({self.table}, {weights}) AS score FROM {self.table} "
+                f"WHERE {self.table} MATCH %s ORDER BY rowid DESC LIMIT %s) "
+                f"ORDER BY score, rowid DESC LIMIT %s OFFSET %s",
+                [self.match_expression(company, terms), MAX_MATCHES, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def scan(self, company, terms):
+        """
+        The naive query: `icontains` on every column, prefix matches first.
+        """
+        queryset = self.model.objects.filter(**{self.company_field: company})
+        for term in terms:
+            queryset = queryset.filter(self._any(term, 'icontains'))
+        return queryset.annotate(
+            prefix=Case(When(self._any(terms[0], 'istartswith'), then=Value(0)), default=Value(1), output_field=IntegerField())
+        ).order_by('prefix', '-id')
+
+    def _any(self, term, lookup):
+        condition = Q()
+        for column in self.columns:
+            condition |= Q(**{f'{column}__{lookup}': term})
+        return condition
+
+
+SEARCH_INDEXES = {
+    'devices': SearchIndex(Device, 'tracker_device_fts', ('name', 'serial_no'), 'owner'),
+    'employees': SearchIndex(Employee, 'tracker_employee_fts', ('name', 'email'), 'company'),
+}
+
+
+def search_terms(query):
+    """
+    Split a query on whitespace; terms shorter than MIN_TERM_LENGTH are dropped.
+    """
+    return [term for term in re.split(r'\s+', query.strip()) if len(term) >= MIN_TERM_LENGTH]
+
+
+class SearchResults:
+    """
+    Lazy, sliceable search result for DRF's LimitOffsetPagination: `count()`
+    is one query, a slice is a page of ids from the index plus one query
+    loading those rows (in rank order) through `queryset`.
+    """
+
+    def __init__(self, index, company, terms, queryset):
+        self.index = index
+        self.company = company
+        self.terms = terms
+        self.queryset = queryset
+
+    def count(self):
+        if not self.index.indexed:
+            return min(self.index.scan(self.company, self.terms).count(), MAX_MATCHES)
+        return self.index.count(self.company, self.terms)
+
+    def __getitem__(self, page):
+        if not self.index.indexed:
+            ids = list(self.index.scan(self.company, self.terms).values_list('pk', flat=True)[page.start:min(page.stop, MAX_MATCHES)])
+        else:
+            ids = self.index.ids(self.company, self.terms, page.start or 0, page.stop - (page.start or 0))
+        rows = {row.pk: row for row in self.queryset.filter(pk__in=ids)}
+        return [rows[pk] for pk in ids if pk in rows]
@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from tracker.models import Company, Employee, Device, DeviceLog, User
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from tracker.fieldsets import FieldsetSerializerMixin
+from tracker.models import ArchivedDeviceLog, Company, Employee, Device, DeviceLog, User
+from tracker.revocation import revocation_store
 
 # User
 class UserLoginSerializer(serializers.ModelSerializer):
@@ -36,18 +41,18 @@ class CompanyRegistrationSerializer(serializers.ModelSerializer):
         validated_data['owner'] = owner
         return super().create(validated_data)
     
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     owner = UserSerializer(many=False)
     class Meta:
         model = Company
-        fields = "__all__"
+        fields = ['id', 'owner', 'created_at', 'updated_at', 'name']
 # Employee
 class CompanySerializerForEmployee(serializers.ModelSerializer):
     owner = UserSerializer(many=False)
     class Meta:
         model = Company
         fields = ['id', 'name','owner']
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     company = CompanySerializerForEmployee(many=False, required=False)
     class Meta:
         model = Employee
@@ -60,24 +65,111 @@ class EmployeeSerializer(serializers.ModelSerializer):
             self.fields['name'].required = False
 
 # Device
-class DeviceSerializer(serializers.ModelSerializer):
+class DeviceSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     owner = CompanySerializerForEmployee(many=False, required=False)
     class Meta:
         model = Device
         fields = "__all__"
+        read_only_fields = ['current_log']
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.context['request'].method == 'PUT':
             self.fields['serial_no'].required = False
             self.fields['name'].required = False
 
-class DeviceLogSerializer(serializers.ModelSerializer):
+class DeviceLogSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = DeviceLog
-        fields = "__all__"
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.context['request'].method == 'PUT':
-            self.fields['checked_out_condition'].required = False
-            self.fields['device'].required = False
-            self.fields['checked_out_by'].required = False
+        # The company is the device's owner, set by the views.
+        exclude = ['company']
+        read_only_fields = ['returned_at']
+        # The one-open-loan constraint is enforced by the check-out claim, not a pre-query.
+        validators = []
+
+class DeviceCheckInSerializer(DeviceLogSerializer):
+    # A check-in only records the returned condition: the loan's device and employee never change.
+    class Meta(DeviceLogSerializer.Meta):
+        read_only_fields = ['device', 'checked_out_by', 'checked_out_condition', 'returned_at']
+
+class ArchivedDeviceLogSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    # Same body as DeviceLogSerializer, so hot and archived pages look alike.
+    class Meta:
+        model = ArchivedDeviceLog
+        fields = ['id', 'created_at', 'updated_at', 'checked_out_condition', 'checked_in_condition', 'returned_at', 'device', 'checked_out_by']
+        read_only_fields = fields
+
+class DeviceLogHistorySerializer(serializers.Serializer):
+    archived = serializers.BooleanField(default=False)
+
+class CheckedOutEmployeeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Employee
+        fields = ['id', 'name', 'email']
+
+class CheckedOutDeviceSerializer(serializers.ModelSerializer):
+    log = serializers.IntegerField(source='current_log_id')
+    checked_out_at = serializers.DateTimeField(source='current_log.created_at')
+    checked_out_condition = serializers.CharField(source='current_log.checked_out_condition')
+    checked_out_by = CheckedOutEmployeeSerializer(source='current_log.checked_out_by')
+    class Meta:
+        model = Device
+        fields = ['id', 'name', 'serial_no', 'log', 'checked_out_at', 'checked_out_condition', 'checked_out_by']
+
+# Bulk check-out / check-in
+BULK_MAX_ITEMS = 500
+
+class BulkCheckOutItemSerializer(serializers.Serializer):
+    device = serializers.IntegerField()
+    checked_out_by = serializers.IntegerField()
+    checked_out_condition = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
+
+class BulkCheckOutSerializer(serializers.Serializer):
+    items = BulkCheckOutItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+class BulkCheckInItemSerializer(serializers.Serializer):
+    log = serializers.IntegerField()
+    checked_in_condition = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
+
+class BulkCheckInSerializer(serializers.Serializer):
+    items = BulkCheckInItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+# Import
+class ImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    start_line = serializers.IntegerField(min_value=0, default=0)
+    batch_size = serializers.IntegerField(min_value=1, max_value=5000, default=1000)
+
+# Analytics
+class AnalyticsWindowSerializer(serializers.Serializer):
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('since') and attrs.get('until') and attrs['since'] > attrs['until']:
+            raise serializers.ValidationError("since must not be after until.")
+        return attrs
+
+class SearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+
+    def validate_q(self, value):
+        from tracker.search import MIN_TERM_LENGTH, search_terms
+
+        terms = search_terms(value)
+        if not terms:
+            raise serializers.ValidationError(f"Enter at least one term of {MIN_TERM_LENGTH} or more characters.")
+        return terms
+
+# Token refresh
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        try:
+            token = RefreshToken(attrs['refresh'])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        if revocation_store.is_revoked(token[api_settings.JTI_CLAIM]):
+            raise InvalidToken("Token is blacklisted")
+        attrs['token'] = token
+        return attrs
@@ -0,0 +1,147 @@
+from django.db import transaction
+from django.utils import timezone
+
+from tracker import outbox
+from tracker.analytics import record_check_ins, record_check_outs
+from tracker.models import Device, DeviceLog, Employee
+from tracker.versioning import bump_company_version
+
+
+# Check-out / check-in
+def claim_device(device_id):
+    """
+    Mark a device unavailable only if it is currently available.
+
+    A single conditional UPDATE, so concurrent check-outs of the same device
+    cannot both succeed. Returns True when this call won the device.
+    """
+    return Device.objects.filter(pk=device_id, is_available=True).update(
+        is_available=False, updated_at=timezone.now()
+    ) == 1
+
+
+def attach_loan(device_id, log):
+    """
+    Point the device at its open loan so "who has it" is a single lookup.
+    """
+    Device.objects.filter(pk=device_id).update(current_log=log)
+
+
+def close_loan(log_id, **fields):
+    """
+    Stamp `returned_at` (and any other `fields`) on a loan only if it is
+    still open, in one UPDATE.
+
+    Returns the return time, or None when the loan was already closed.
+    """
+    now = timezone.now()
+    closed = DeviceLog.objects.filter(pk=log_id, returned_at__isnull=True).update(returned_at=now, updated_at=now, **fields)
+    return now if closed else None
+
+
+def release_device(device_id):
+    """
+    Mark a device available only if it is currently checked out.
+    """
+    return Device.objects.filter(pk=device_id, is_available=False).update(
+        is_available=True, current_log=None, updated_at=timezone.now()
+    ) == 1
+
+
+# Bulk check-out / check-in
+def _result(index, **fields):
+    return {'index': index, **fields}
+
+
+def bulk_check_out(company, items):
+    """
+    Check out many devices in one transaction.
+
+    `items` is a list of {'device', 'checked_out_by', 'checked_out_condition'}
+    dicts holding primary keys. Every item gets a result; invalid items are
+    reported and skipped without failing the rest of the batch.
+    """
+    device_ids = {item['device'] for item in items}
+    employee_ids = set(
+        Employee.objects.filter(company=company, pk__in={item['checked_out_by'] for item in items})
+        .values_list('pk', flat=True)
+    )
+    with transaction.atomic():
+        availability = dict(
+            Device.objects.select_for_update()
+            .filter(owner=company, pk__in=device_ids)
+            .values_list('pk', 'is_available')
+        )
+        results, logs, claimed = [], [], set()
+        for index, item in enumerate(items):
+            device_id = item['device']
+            if device_id not in availability:
+                results.append(_result(index, device=device_id, status='error', error="Device not found."))
+            elif item['checked_out_by'] not in employee_ids:
+                results.append(_result(index, device=device_id, status='error', error="Employee not found."))
+            elif device_id in claimed or not availability[device_id]:
+                results.append(_result(index, device=device_id, status='error', error="Device already used by another employee."))
+            else:
+                claimed.add(device_id)
+                logs.append(DeviceLog(
+                    company_id=company.pk,
+                    device_id=device_id,
+                    checked_out_by_id=item['checked_out_by'],
+                    checked_out_condition=item.get('checked_out_condition'),
+                ))
+                results.append(_result(index, device=device_id, status='checked_out'))
+
+        if claimed:
+            created = DeviceLog.objects.bulk_create(logs)
+            now = timezone.now()
+            # The claimed rows are locked above, so one CASE update flips them and sets their loan pointer.
+            Device.objects.bulk_update(
+                [Device(pk=log.device_id, is_available=False, current_log=log, updated_at=now) for log in created],
+                ['is_available', 'current_log', 'updated_at'],
+            )
+            record_check_outs(company.pk, created)
+            outbox.record_check_outs(company.pk, created)
+            bump_company_version(company.pk)
+            created = iter(created)
+            for result in results:
+                if result['status'] == 'checked_out':
+                    result['log'] = next(created).pk
+    return results
+
+
+def bulk_check_in(company, items):
+    """
+    Return many devices in one transaction.
+
+    `items` is a list of {'log', 'checked_in_condition'} dicts. Only open
+    loans (no `returned_at` yet) can be checked in.
+    """
+    with transaction.atomic():
+        logs = {
+            log.pk: log
+            for log in DeviceLog.objects.select_for_update()
+            .filter(company=company, pk__in={item['log'] for item in items})
+        }
+        results, returned, returned_devices = [], [], set()
+        now = timezone.now()
+        for index, item in enumerate(items):
+            log = logs.get(item['log'])
+            if log is None:
+                results.append(_result(index, log=item['log'], status='error', error="Device log not found."))
+            elif log.returned_at is not None or log.device_id in returned_devices:
+                results.append(_result(index, log=log.pk, status='error', error="Device already returned."))
+            else:
+                returned_devices.add(log.device_id)
+                log.checked_in_condition = item.get('checked_in_condition')
+                log.returned_at = now
+                log.updated_at = now
+                returned.append(log)
+                results.append(_result(index, log=log.pk, status='checked_in'))
+
+        if returned:
+            Device.objects.filter(pk__in=returned_devices).update(is_available=True, current_log=None, updated_at=now)
+            DeviceLog.objects.bulk_update(returned, ['checked_in_condition', 'returned_at', 'updated_at'])
+            record_check_ins(company.pk, returned)
+            outbox.record_check_ins(company.pk, returned)
+            bump_company_version(company.pk)
+    return results
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tracker.models import Company, CompanyVersion, Device, DeviceLog, Employee
+from tracker.tenancy import company_cache
+from tracker.versioning import bump_company_version, bump_device_company_version
+
+
+# Tenant cache
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_cache(sender, instance, **kwargs):
+    company_cache.invalidate(instance)
+
+
+# Version counters. Bulk writes (bulk_create / update) send no signals and
+# bump the version themselves.
+@receiver(post_save, sender=Company)
+def bump_company(sender, instance, created, **kwargs):
+    if created:
+        CompanyVersion.objects.create(company=instance)
+    else:
+        bump_company_version(instance.pk)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def bump_employee_company(sender, instance, **kwargs):
+    bump_company_version(instance.company_id)
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+def bump_device_company(sender, instance, **kwargs):
+    bump_company_version(instance.owner_id)
+
+
+@receiver(post_save, sender=DeviceLog)
+@receiver(post_delete, sender=DeviceLog)
+def bump_device_log_company(sender, instance, **kwargs):
+    bump_device_company_version(instance.device_id)
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from tracker.models import Company
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 60
+
+
+class CompanyCache:
+    """
+    Per-process LRU cache of owner id -> Company with a time-to-live.
+
+    Company saves and deletes invalidate their entry (see tracker.signals);
+    the TTL bounds staleness for changes made by other processes.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id):
+        with self._lock:
+            entry = self._entries.get(owner_id)
+            if entry is None:
+                return None
+            company, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[owner_id]
+                return None
+            self._entries.move_to_end(owner_id)
+            return company
+
+    def set(self, owner_id, company):
+        with self._lock:
+            self._entries[owner_id] = (company, time.monotonic() + self.ttl)
+            self._entries.move_to_end(owner_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, company):
+        with self._lock:
+            self._entries.pop(company.owner_id, None)
+            # The owner may have changed; drop any entry still pointing at this company.
+            stale = [owner_id for owner_id, (cached, _) in self._entries.items() if cached.pk == company.pk]
+            for owner_id in stale:
+                del self._entries[owner_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _build_cache():
+    options = getattr(settings, 'TRACKER_COMPANY_CACHE', {})
+    return CompanyCache(
+        max_size=options.get('MAX_SIZE', DEFAULT_MAX_SIZE),
+        ttl=options.get('TTL', DEFAULT_TTL),
+    )
+
+
+company_cache = _build_cache()
+
+
+def check_company_claim(user, company):
+    """
+    Return `company` if it matches the company claim of the access token.
+
+    The claim is fixed when the token is issued; if that company has since
+    been deleted or changed owner, the token is rejected rather than
+    scoping reads to a tenant that is gone and writes to a missing row.
+    """
+    claimed = getattr(user, 'company_id', None)
+    if claimed is not None and (company is None or company.pk != claimed):
+        raise AuthenticationFailed("The company of this token no longer exists. Log in again.", code='company_changed')
+    return company
+
+
+def get_company_for_user(user):
+    """
+    Return the company owned by `user`, or None.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    company = company_cache.get(user.pk)
+    if company is None:
+        company = Company.objects.filter(owner_id=user.pk).first()
+        if company is not None:
+            company_cache.set(user.pk, company)
+    return check_company_claim(user, company)
+
+
+def get_request_company(request):
+    """
+    Resolve the tenant of `request` once and remember it on the request.
+    """
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_tracker_company'):
+        http_request._tracker_company = get_company_for_user(request.user)
+    return http_request._tracker_company
+
+
+async def aget_company_for_user(user):
+    """
+    `get_company_for_user` for async views.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    company = company_cache.get(user.pk)
+    if company is None:
+        company = await Company.objects.filter(owner_id=user.pk).afirst()
+        if company is not None:
+            company_cache.set(user.pk, company)
+    return check_company_claim(user, company)
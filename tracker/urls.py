@@ -1,5 +1,6 @@
-from django.urls import path, include
-from tracker.views import UserLoginView, CompanyView, EmployeeView, DeviceView, DeviceLogView, DeviceCheckInView, DeviceCheckOutView,DeviceCheckInView
+from django.urls import path, re_path, include
+from tracker.views import UserLoginView, TokenRefreshView, CompanyView, EmployeeView, DeviceView, DeviceLogView, DeviceCheckInView, DeviceCheckOutView,DeviceCheckInView, BulkDeviceCheckOutView, BulkDeviceCheckInView, DeviceLogExportView, DeviceExportView, EmployeeExportView, ImportView, SearchView, DeviceUtilizationView, EmployeeUtilizationView
+from tracker.async_views import AsyncApiRootView, AsyncEmployeeListView, AsyncEmployeeDetailView, AsyncDeviceListView, AsyncDeviceDetailView, AsyncDeviceLogListView
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
@@ -11,7 +12,23 @@ router.register(r'devices', DeviceView, basename='device-api')
 urlpatterns = [
     path('', include(router.urls)),
     path('login/', UserLoginView.as_view(), name='login-api'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path('device-logs/', DeviceLogView.as_view(), name='device-logs-api'),
     path('check-out/', DeviceCheckOutView.as_view(), name="check-out"),
+    path('check-out/bulk/', BulkDeviceCheckOutView.as_view(), name="bulk-check-out"),
+    path('check-in/bulk/', BulkDeviceCheckInView.as_view(), name="bulk-check-in"),
     path('check-in/<pk>/', DeviceCheckInView.as_view(), name="check-in"),
+    path('export/device-logs/', DeviceLogExportView.as_view(), name="export-device-logs"),
+    path('export/devices/', DeviceExportView.as_view(), name="export-devices"),
+    path('export/employees/', EmployeeExportView.as_view(), name="export-employees"),
+    path('analytics/devices/', DeviceUtilizationView.as_view(), name="analytics-devices"),
+    path('analytics/employees/', EmployeeUtilizationView.as_view(), name="analytics-employees"),
+    path('async/', AsyncApiRootView.as_view(), name="async-api-root"),
+    path('async/employees/', AsyncEmployeeListView.as_view(), name="async-employee-list"),
+    path('async/employees/<pk>/', AsyncEmployeeDetailView.as_view(), name="async-employee-detail"),
+    path('async/devices/', AsyncDeviceListView.as_view(), name="async-device-list"),
+    path('async/devices/<pk>/', AsyncDeviceDetailView.as_view(), name="async-device-detail"),
+    path('async/device-logs/', AsyncDeviceLogListView.as_view(), name="async-device-logs"),
+    re_path(r'^import/(?P<kind>employees|devices)/$', ImportView.as_view(), name="import"),
+    re_path(r'^search/(?P<kind>employees|devices)/$', SearchView.as_view(), name="search"),
 ]
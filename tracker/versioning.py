@@ -0,0 +1,102 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+
+from tracker.models import CompanyVersion
+
+DEFAULT_RESPONSE_CACHE_TIMEOUT = 300
+
+
+# Version counters
+def bump_company_version(company_id):
+    """
+    Record that some of a company's data changed.
+
+    A single UPDATE, so it joins whatever transaction the change is part of.
+    """
+    CompanyVersion.objects.filter(company_id=company_id).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def bump_device_company_version(device_id):
+    """
+    Bump the version of the company owning `device_id` without loading the device.
+    """
+    CompanyVersion.objects.filter(company__devices=device_id).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def get_company_version(company_id):
+    """
+    Return the (version, updated_at) of a company, creating its counter if needed.
+    """
+    row = CompanyVersion.objects.filter(company_id=company_id).values_list('version', 'updated_at').first()
+    if row is None:
+        counter, _ = CompanyVersion.objects.get_or_create(company_id=company_id)
+        row = (counter.version, counter.updated_at)
+    return row
+
+
+async def aget_company_version(company_id):
+    """
+    `get_company_version` for async views.
+    """
+    row = await CompanyVersion.objects.filter(company_id=company_id).values_list('version', 'updated_at').afirst()
+    if row is None:
+        counter, _ = await CompanyVersion.objects.aget_or_create(company_id=company_id)
+        row = (counter.version, counter.updated_at)
+    return row
+
+
+def make_etag(company_id, version, request):
+    """
+    An ETag for one representation of a company's data at `version`.
+
+    The URL (path, query string and host, which the pagination links embed)
+    and the negotiated media type select the representation.
+    """
+    representation = f'{request.build_absolute_uri()}|{request.accepted_media_type}'
+    digest = hashlib.md5(representation.encode(), usedforsecurity=False).hexdigest()[:16]
+    return f'"{company_id}-{version}-{digest}"'
+
+
+# Response cache
+def _cache_options():
+    return getattr(settings, 'TRACKER_RESPONSE_CACHE', {})
+
+
+def response_cache_enabled():
+    return _cache_options().get('ENABLED', False)
+
+
+def _cache():
+    return caches[_cache_options().get('CACHE', 'default')]
+
+
+def get_cached_response(etag):
+    """
+    Serialized response data stored for `etag`, or None.
+
+    Keys embed the version, so a change makes older entries unreachable and
+    they simply expire.
+    """
+    return _cache().get(f'tracker:response:{etag}')
+
+
+def cache_response(etag, data):
+    _cache().set(
+        f'tracker:response:{etag}', data,
+        _cache_options().get('TIMEOUT', DEFAULT_RESPONSE_CACHE_TIMEOUT),
+    )
+
+
+async def aget_cached_response(etag):
+    return await _cache().aget(f'tracker:response:{etag}')
+
+
+async def acache_response(etag, data):
+    await _cache().aset(
+        f'tracker:response:{etag}', data,
+        _cache_options().get('TIMEOUT', DEFAULT_RESPONSE_CACHE_TIMEOUT),
+    )
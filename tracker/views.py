@@ -3,19 +3,41 @@ from rest_framework import viewsets, generics,status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils import timezone
-from tracker.models import Company, Employee, Device, DeviceLog,User
-from tracker.serializers import UserLoginSerializer, CompanyRegistrationSerializer, CompanySerializer, EmployeeSerializer, DeviceSerializer, DeviceLogSerializer
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from tracker.models import ArchivedDeviceLog, Company, Employee, Device, DeviceLog,User
+from tracker.serializers import UserLoginSerializer, CompanyRegistrationSerializer, CompanySerializer, EmployeeSerializer, DeviceSerializer, DeviceLogSerializer, DeviceCheckInSerializer, ArchivedDeviceLogSerializer, DeviceLogHistorySerializer, CheckedOutDeviceSerializer, BulkCheckOutSerializer, BulkCheckInSerializer, ImportSerializer, AnalyticsWindowSerializer, SearchSerializer, TokenRefreshSerializer
+from tracker.services import bulk_check_out, bulk_check_in, claim_device, attach_loan, close_loan, release_device
 from rest_framework.exceptions import NotFound
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from tracker.revocation import revocation_store
 from rest_framework.permissions import IsAuthenticated
 from tracker.permission import ManageCompany
+from tracker.mixins import CompanyScopedMixin, ConditionalGetMixin, FastListMixin, QueryPlanMixin
+from tracker import analytics, outbox
+from tracker.authentication import COMPANY_CLAIM, STAFF_CLAIM
+from tracker.tenancy import get_company_for_user
+from tracker.versioning import bump_company_version
+from tracker.pagination import SearchPagination
 from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from tracker.filters import ArchivedDeviceLogFilter, DeviceFilter, DeviceLogFilter, EmployeeFilter
 # Create your views here.
 
 # JWT Token
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
+    # Claims copied into every access token; ClaimsJWTAuthentication reads them instead of the User row.
+    company = get_company_for_user(user)
+    refresh[STAFF_CLAIM] = user.is_staff
+    refresh[COMPANY_CLAIM] = company.pk if company is not None else None
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -37,10 +59,32 @@ class UserLoginView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class TokenRefreshView(APIView):
+    """
+    Exchange a refresh token for a new access token (and, with rotation, a
+    new refresh token). The user is re-checked here, so deactivation and
+    claim changes apply at the next refresh; the rotated token is revoked.
+    """
+    def post(self, request, format=None):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        refresh = serializer.validated_data['token']
+        user = User.objects.filter(pk=refresh[jwt_settings.USER_ID_CLAIM], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed("No active account found for the given token.", code='no_active_account')
+        if not jwt_settings.ROTATE_REFRESH_TOKENS:
+            return Response({'access': get_tokens_for_user(user)['access']}, status=status.HTTP_200_OK)
+        # Revoking is the authoritative check: only one request can rotate a given token.
+        if jwt_settings.BLACKLIST_AFTER_ROTATION:
+            if not revocation_store.revoke(refresh[jwt_settings.JTI_CLAIM], datetime_from_epoch(refresh['exp'])):
+                raise InvalidToken("Token is blacklisted")
+        return Response(get_tokens_for_user(user), status=status.HTTP_200_OK)
+
 # Company
-class CompanyView(viewsets.ModelViewSet):
+class CompanyView(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Company.objects.all()
     permission_classes = [ManageCompany]
+    select_related_fields = ('owner',)
     def get_serializer_class(self):
         if self.request.method == "POST":
             return CompanyRegistrationSerializer
@@ -64,89 +108,241 @@ class CompanyView(viewsets.ModelViewSet):
         
         return Response(serializer.data)
 
-class EmployeeView(viewsets.ModelViewSet):
+class EmployeeView(CompanyScopedMixin, ConditionalGetMixin, FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated]
+    select_related_fields = ('company__owner',)
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = EmployeeFilter
+    ordering_fields = ['created_at', 'name']
 
     def get_queryset(self):
-        try:
-            company = Company.objects.get(owner=self.request.user)
-            queryset = Employee.objects.filter(company=company)
-            return queryset
-        except Company.DoesNotExist:
-            raise NotFound("Company not found")
-        
+        return Employee.objects.filter(company=self.get_company())
+
     def perform_create(self, serializer):
-        try:
-            company = Company.objects.get(owner=self.request.user)
-            serializer.save(company=company)
-        except AttributeError:
-            return Response({"error": "User doesn't have a company"}, status=status.HTTP_400_BAD_REQUEST)
-        
+        serializer.save(company=self.get_company())
+
 # Device
-class DeviceView(viewsets.ModelViewSet):
+class DeviceView(CompanyScopedMixin, ConditionalGetMixin, FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Device.objects.all()
     serializer_class = DeviceSerializer
     permission_classes = [IsAuthenticated]
+    select_related_fields = ('owner__owner',)
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = DeviceFilter
+    ordering_fields = ['created_at', 'name']
     def get_queryset(self):
-        try:
-            company = Company.objects.get(owner=self.request.user)
-            queryset = Device.objects.filter(owner=company.id)
-            return queryset
-        except Company.DoesNotExist:
-            raise NotFound("Company not found")
+        return Device.objects.filter(owner=self.get_company())
+
     def perform_create(self, serializer):
-        try:
-            company = Company.objects.get(owner=self.request.user)
-            serializer.save(owner=company)
-        except AttributeError:
-            return Response({"error": "User doesn't have a company"}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(owner=self.get_company())
 
-class DeviceLogView(generics.ListAPIView):
+    @action(detail=False, url_path='checked-out', url_name='checked-out')
+    def checked_out(self, request):
+        return self.conditional_response(request, self.list_checked_out)
+
+    def list_checked_out(self, request):
+        # Who has what now: one query over the partial index of devices with an open loan.
+        queryset = (
+            Device.objects.filter(owner=self.get_company(), current_log__isnull=False)
+            .select_related('current_log__checked_out_by')
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = CheckedOutDeviceSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class DeviceLogView(CompanyScopedMixin, ConditionalGetMixin, FastListMixin, QueryPlanMixin, generics.ListAPIView):
     queryset = DeviceLog.objects.all()
     serializer_class = DeviceLogSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    ordering_fields = ['created_at']
+
+    def reads_archive(self):
+        # Recent loans come from DeviceLog; ?archived=true reads the older, archived ones.
+        if not hasattr(self, '_reads_archive'):
+            serializer = DeviceLogHistorySerializer(data=self.request.query_params)
+            serializer.is_valid(raise_exception=True)
+            self._reads_archive = serializer.validated_data['archived']
+        return self._reads_archive
+
+    @property
+    def filterset_class(self):
+        return ArchivedDeviceLogFilter if self.reads_archive() else DeviceLogFilter
+
+    def get_serializer_class(self):
+        return ArchivedDeviceLogSerializer if self.reads_archive() else DeviceLogSerializer
+
     def get_queryset(self):
-        try:
-            company = Company.objects.get(owner=self.request.user)
-            queryset = DeviceLog.objects.filter(device__owner=company)
-            return queryset
-        except Company.DoesNotExist:
-            raise NotFound("Company not found")
-
-class DeviceCheckOutView(generics.CreateAPIView):
+        if self.reads_archive():
+            return ArchivedDeviceLog.objects.filter(company=self.get_company())
+        return DeviceLog.objects.filter(company=self.get_company())
+
+class DeviceCheckOutView(CompanyScopedMixin, generics.CreateAPIView):
     queryset = DeviceLog.objects.all()
     serializer_class = DeviceLogSerializer
     permission_classes = [IsAuthenticated]
     def perform_create(self, serializer):
+        company = self.get_company()
         device = serializer.validated_data.get('device')
-        if not device.is_available:
-            raise serializers.ValidationError("Device already used by another employee.")
-        device.is_available = False
-        device.save()
-        return serializer.save()
+        employee = serializer.validated_data.get('checked_out_by')
+        if device.owner_id != company.pk or employee.company_id != company.pk:
+            raise serializers.ValidationError("Device or employee does not belong to your company.")
+        with transaction.atomic():
+            if not claim_device(device.pk):
+                raise serializers.ValidationError("Device already used by another employee.")
+            log = serializer.save(company=company)
+            attach_loan(device.pk, log)
+            analytics.record_check_outs(company.pk, [log])
+            outbox.record_check_outs(company.pk, [log])
+            return log
 
-class DeviceCheckInView(generics.RetrieveUpdateAPIView):
+class DeviceCheckInView(CompanyScopedMixin, generics.RetrieveUpdateAPIView):
     queryset = DeviceLog.objects.all()
-    serializer_class = DeviceLogSerializer
+    serializer_class = DeviceCheckInSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return DeviceLog.objects.filter(company=self.get_company())
+
     def perform_update(self, serializer):
-        try:
-            instance = self.get_object()
-            device = instance.device
-            if instance.updated_at is not None:
-                return Response(
-                    {"error": "Device already returned."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            device.is_available = True
-            device.save()
-            serializer.save()
-        except DeviceLog.DoesNotExist:
-            return Response(
-                {"error": "Device log not found."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
+        # close_loan writes the row; the serializer is not saved, so nothing else in the body is applied.
+        log = serializer.instance
+        changes = {
+            name: serializer.validated_data[name] for name in ('checked_in_condition',) if name in serializer.validated_data
+        }
+        company = self.get_company()
+        with transaction.atomic():
+            returned_at = close_loan(log.pk, **changes)
+            if returned_at is None:
+                raise serializers.ValidationError("Device already returned.")
+            release_device(log.device_id)
+            for name, value in changes.items():
+                setattr(log, name, value)
+            log.returned_at = log.updated_at = returned_at
+            analytics.record_check_ins(company.pk, [log])
+            outbox.record_check_ins(company.pk, [log])
+            # The UPDATEs above send no post_save, so bump the version ourselves.
+            bump_company_version(company.pk)
+
+class BulkDeviceCheckOutView(CompanyScopedMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        serializer = BulkCheckOutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_check_out(self.get_company(), serializer.validated_data['items'])
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+class BulkDeviceCheckInView(CompanyScopedMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        serializer = BulkCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_check_in(self.get_company(), serializer.validated_data['items'])
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+# Export
+class ExportView(CompanyScopedMixin, APIView):
+    """
+    Stream every row of a company's collection as CSV (default) or NDJSON
+    (`?format=ndjson`). Supports `since` / `until` on created_at.
+    """
+    permission_classes = [IsAuthenticated]
+    rows = None # Name of the tracker.exports function returning the columns and rows
+    filename = None
+
+    def get_renderers(self):
+        from tracker import exports  # loaded by the first export, not at worker start
+
+        return [exports.CSVRenderer(), exports.NDJSONRenderer()]
+
+    def get(self, request, format=None):
+        from tracker import exports
+
+        columns, queryset = getattr(exports, self.rows)(self.get_company(), request.query_params)
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            exports.STREAMS[renderer.format](columns, queryset),
+            content_type=f'{renderer.media_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.filename}.{renderer.format}"'
+        return response
+
+class DeviceLogExportView(ExportView):
+    rows = 'device_log_rows'
+    filename = 'device-logs'
+
+class DeviceExportView(ExportView):
+    rows = 'device_rows'
+    filename = 'devices'
+
+class EmployeeExportView(ExportView):
+    rows = 'employee_rows'
+    filename = 'employees'
+
+# Import
+class ImportView(CompanyScopedMixin, APIView):
+    """
+    Import employees or devices from an uploaded CSV, batch by batch.
+    Pass `start_line` (the `next_line` of an earlier run) to resume.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind, format=None):
+        from tracker import imports  # loaded by the first import, not at worker start
+
+        serializer = ImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        importer = imports.IMPORTERS[kind](self.get_company(), batch_size=data['batch_size'])
+        summary = importer.run(imports.text_stream(data['file'].file), start_line=data['start_line'])
+        return Response(summary, status=status.HTTP_200_OK)
+
+# Search
+class SearchView(CompanyScopedMixin, generics.ListAPIView):
+    """
+    Ranked substring search with `?q=`: devices by name or serial number,
+    employees by name or email. Every term of 3+ characters must match.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+    serializer_classes = {'devices': DeviceSerializer, 'employees': EmployeeSerializer}
+    select_related_fields = {'devices': ('owner__owner',), 'employees': ('company__owner',)}
+
+    def get_serializer_class(self):
+        return self.serializer_classes[self.kwargs['kind']]
+
+    def get_queryset(self):
+        from tracker.search import SEARCH_INDEXES, SearchResults  # loaded by the first search, not at worker start
+
+        kind = self.kwargs['kind']
+        serializer = SearchSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        index = SEARCH_INDEXES[kind]
+        company = self.get_company()
+        queryset = index.model.objects.filter(**{index.company_field: company}).select_related(*self.select_related_fields[kind])
+        return SearchResults(index, company, serializer.validated_data['q'], queryset)
+
+# Analytics
+class UtilizationView(CompanyScopedMixin, APIView):
+    """
+    Usage statistics over `since`..`until` (default: the last 30 days),
+    answered from the daily rollup tables rather than DeviceLog.
+    """
+    permission_classes = [IsAuthenticated]
+    report = None
+
+    def get(self, request, format=None):
+        serializer = AnalyticsWindowSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(self.report(self.get_company(), **serializer.validated_data))
+
+class DeviceUtilizationView(UtilizationView):
+    report = staticmethod(analytics.device_utilization)
+
+class EmployeeUtilizationView(UtilizationView):
+    report = staticmethod(analytics.employee_utilization)